@@ -0,0 +1,13 @@
+-- Migration: 0025_add_knowledge_embedding_vector_blob
+-- Adds a compact binary vector column to knowledge_embeddings.
+-- Written by the Python ingestion scripts with --vector-format f32|f16|int8 and
+-- by scripts/migrate_embedding_vectors.py for existing rows.
+--
+-- Encoding (little-endian): uint8 format (1 = float32, 2 = float16, 3 = int8),
+-- uint16 dimensions, then for int8 a float32 scale, then the packed components.
+-- Rows also keep their JSON `embedding` as the fallback. The blob is carried to
+-- Postgres by scripts/dev/migrate-legacy-tidb-to-postgres.ts and decoded by
+-- server/embedding-vector.ts, which vector search prefers over the JSON.
+
+ALTER TABLE knowledge_embeddings
+ADD COLUMN embedding_vector MEDIUMBLOB NULL AFTER embedding;
@@ -0,0 +1,9 @@
+-- Migration: 0026_add_knowledge_embedding_chunk_index
+-- Position of a row within its source item. The Python ingestion scripts split
+-- content longer than the chunk budget (scripts/knowledge_ingest/chunking.py)
+-- into several rows that share sourceType/sourceId; unsplit items are chunk 0.
+
+ALTER TABLE knowledge_embeddings
+ADD COLUMN chunk_index INT NOT NULL DEFAULT 0 AFTER source_chunk_id;
+
+CREATE INDEX source_chunk_idx ON knowledge_embeddings (sourceType, sourceId, chunk_index);
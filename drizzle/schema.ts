@@ -1,6 +1,13 @@
-import { mysqlTable, index, uniqueIndex, int, varchar, text, timestamp, mysqlEnum, json, decimal, float, tinyint } from "drizzle-orm/mysql-core"
+import { mysqlTable, index, uniqueIndex, int, varchar, text, timestamp, mysqlEnum, json, decimal, float, tinyint, customType } from "drizzle-orm/mysql-core"
 import { sql } from "drizzle-orm"
 
+// mysql-core has no BLOB column builder
+const mediumblob = customType<{ data: Buffer }>({
+	dataType() {
+		return "mediumblob";
+	},
+});
+
 export const advisoryReportVersions = mysqlTable("advisory_report_versions", {
 	id: int().autoincrement().notNull(),
 	reportId: int().notNull(),
@@ -1084,12 +1091,16 @@ export const knowledgeEmbeddings = mysqlTable("knowledge_embeddings", {
 	content: text().notNull(),
 	contentHash: varchar({ length: 64 }).notNull(),
 	embedding: json().notNull(),
+	// Packed vector (see scripts/knowledge_ingest/vectors.py), migration 0025
+	embeddingVector: mediumblob("embedding_vector"),
 	embeddingModel: varchar({ length: 64 }).default('text-embedding-3-small').notNull(),
 	title: varchar({ length: 512 }).notNull(),
 	url: varchar({ length: 512 }),
 	datasetId: varchar({ length: 255 }),
 	datasetVersion: varchar({ length: 64 }),
 	sourceChunkId: int("source_chunk_id"),
+	// Position of the row within its split source item, migration 0026
+	chunkIndex: int("chunk_index").default(0).notNull(),
 	lastVerifiedDate: timestamp({ mode: 'string' }),
 	isDeprecated: tinyint().default(0).notNull(),
 	deprecationReason: text(),
@@ -1102,6 +1113,7 @@ export const knowledgeEmbeddings = mysqlTable("knowledge_embeddings", {
 	index("source_chunk_id_idx").on(table.sourceChunkId),
 	index("content_hash_idx").on(table.contentHash),
 	index("source_composite_idx").on(table.sourceType, table.sourceId),
+	index("source_chunk_idx").on(table.sourceType, table.sourceId, table.chunkIndex),
 ]);
 
 export const mappingFeedback = mysqlTable("mapping_feedback", {
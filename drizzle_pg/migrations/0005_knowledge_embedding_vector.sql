@@ -0,0 +1,5 @@
+-- Packed binary embeddings carried over from the legacy embedding_vector
+-- MEDIUMBLOB (drizzle/migrations/0025). Decoded by server/embedding-vector.ts;
+-- the JSON embedding column stays the fallback.
+ALTER TABLE knowledge_embeddings
+  ADD COLUMN IF NOT EXISTS embedding_vector bytea;
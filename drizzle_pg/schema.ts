@@ -11,8 +11,16 @@ import {
   numeric,
   index,
   uniqueIndex,
+  customType,
 } from "drizzle-orm/pg-core";
 
+// pg-core has no bytea column builder
+const bytea = customType<{ data: Buffer }>({
+  dataType() {
+    return "bytea";
+  },
+});
+
 // ---------------------------------------------------------------------------
 // Shared enums
 // ---------------------------------------------------------------------------
@@ -368,6 +376,8 @@ export const knowledgeEmbeddings = pgTable(
     content: text("content").notNull(),
     contentHash: varchar("content_hash", { length: 64 }).notNull(),
     embedding: jsonb("embedding").notNull(),
+    // Packed vector (server/embedding-vector.ts), preferred over `embedding` when set
+    embeddingVector: bytea("embedding_vector"),
     embeddingModel: varchar("embedding_model", { length: 64 })
       .default("text-embedding-3-small")
       .notNull(),
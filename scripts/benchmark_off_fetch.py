@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark Open Food Facts fetch strategies offline against the local stand-in.
+
+  python scripts/benchmark_off_fetch.py
+  python scripts/benchmark_off_fetch.py --fixtures data/off_fixtures --no-synthetic \
+      --latency 0.3 --error-rate 0.05 --max-concurrent 6 --page-sizes 24,100
+
+Every combination of page size and starting concurrency is run twice: with a
+fixed in-flight limit (no growth, no backoff halving) and with the AIMD
+limiter adapting up to --max-concurrency. Each run
+starts from an empty in-memory store, and the server's counters are reset
+between runs, so the numbers are directly comparable.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from typing import List
+
+from off_ingest import SEARCH_TERMS, ProductStore, ServerConfig, fetch_all_products, start_server
+from off_ingest.server import add_server_arguments, config_from_args
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v]
+
+
+async def run_strategy(base_url: str, runner, label: str, target: int, page_size: int,
+                       concurrency: int, max_concurrency: int, adaptive: bool = True):
+    stats = runner.app['stats']
+    store = ProductStore(':memory:')
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        limiter = await fetch_all_products(store, terms=SEARCH_TERMS, target=target, page_size=page_size,
+                                           concurrency=concurrency, max_concurrency=max_concurrency,
+                                           stats_interval=3600, api_base=base_url, adaptive=adaptive)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<16} page {page_size:>4}  {elapsed:7.2f}s  {stats.requests:>5} req  "
+          f"{len(store):>6} products  {stats.throttled:>4} 429  {stats.errors:>4} 5xx  "
+          f"limit {limiter.limit:>2}  p50 {limiter.p50:.2f}s  p95 {limiter.p95:.2f}s")
+    store.close()
+    for name in ('requests', 'fixtures', 'synthetic', 'recorded', 'missing', 'throttled', 'errors',
+                 'max_in_flight', 'bytes'):
+        setattr(stats, name, 0)
+
+
+async def benchmark(config: ServerConfig, args):
+    runner, base_url = await start_server(config)
+    print(f"Stand-in server at {base_url} (latency {config.latency}s +{config.jitter}s, "
+          f"errors {config.error_rate:.0%}, max concurrent {config.max_concurrent or 'unlimited'})")
+    print(f"Target: {args.target} products\n")
+    try:
+        for page_size in args.page_sizes:
+            for concurrency in args.concurrency:
+                await run_strategy(base_url, runner, f'fixed {concurrency}', args.target, page_size,
+                                   concurrency, concurrency, adaptive=False)
+                await run_strategy(base_url, runner, f'aimd {concurrency}->{args.max_concurrency}', args.target,
+                                   page_size, concurrency, args.max_concurrency)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark OFF fetch strategies against a local stand-in')
+    parser.add_argument('--target', type=int, default=2000, help='Products to fetch per run (default: %(default)s)')
+    parser.add_argument('--page-sizes', type=int_list, default=[24, 100],
+                        help='Comma-separated page sizes (default: 24,100)')
+    parser.add_argument('--concurrency', type=int_list, default=[1, 3],
+                        help='Comma-separated starting concurrency levels (default: 1,3)')
+    parser.add_argument('--max-concurrency', type=int, default=16,
+                        help='Ceiling for the AIMD runs (default: %(default)s)')
+    add_server_arguments(parser)
+    parser.set_defaults(latency=0.1, jitter=0.05, latency_per_request=0.01)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(config_from_args(args), args))
+
+
+if __name__ == '__main__':
+    main()
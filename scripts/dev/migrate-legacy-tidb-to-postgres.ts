@@ -91,6 +91,7 @@ type LegacyKnowledgeEmbedding = {
   content: string;
   contentHash: string;
   embedding: unknown;
+  embeddingVector?: Buffer | null;
   embeddingModel: string;
   title: string;
   url: string | null;
@@ -228,6 +229,13 @@ async function main() {
       ])
     );
 
+    // embedding_vector only exists once legacy migration 0025 has been applied
+    const [vectorColumns] = await legacy.query<any[]>(
+      "SHOW COLUMNS FROM knowledge_embeddings LIKE 'embedding_vector'"
+    );
+    const embeddingVectorSelect =
+      vectorColumns.length > 0 ? "embedding_vector AS embeddingVector," : "";
+
     const [legacyKnowledge] = await legacy.query<LegacyKnowledgeEmbedding[]>(
       `
         SELECT
@@ -237,6 +245,7 @@ async function main() {
           content,
           contentHash,
           embedding,
+          ${embeddingVectorSelect}
           embeddingModel,
           title,
           url,
@@ -626,6 +635,7 @@ async function main() {
         content: row.content,
         contentHash: row.contentHash,
         embedding: parseJson<number[]>(row.embedding),
+        embeddingVector: row.embeddingVector ?? null,
         embeddingModel: row.embeddingModel || "text-embedding-3-small",
         title: row.title,
         url: row.url,
@@ -660,6 +670,7 @@ async function main() {
           SET
             content = ${payload.content},
             embedding = ${payload.embedding},
+            embedding_vector = ${payload.embeddingVector},
             embedding_model = ${payload.embeddingModel},
             title = ${payload.title},
             url = ${payload.url},
@@ -696,6 +707,7 @@ async function main() {
           content,
           content_hash,
           embedding,
+          embedding_vector,
           embedding_model,
           title,
           url,
@@ -727,6 +739,7 @@ async function main() {
           ${payload.content},
           ${payload.contentHash},
           ${payload.embedding},
+          ${payload.embeddingVector},
           ${payload.embeddingModel},
           ${payload.title},
           ${payload.url},
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Diff two GS1 Benelux datamodel releases.
+
+Attributes are keyed by BMS ID (GDSN name, then attribute name, when a row
+has none) and code list entries by (list name, code). The report lists what
+was added, removed and modified, so only changed rows need re-embedding.
+
+  python scripts/diff_gs1nl_datamodel.py OLD.xlsx NEW.xlsx
+  python scripts/diff_gs1nl_datamodel.py OLD.xlsx NEW.xlsx --output diff.json \
+      --release-notes data/standards/gs1-nl/benelux-datasource/v3.1.33/supporting/overview-changes-release-31333-nl.xlsx
+"""
+
+import argparse
+import json
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+from openpyxl import load_workbook
+
+from parse_gs1nl_datamodel import parse_workbook
+
+# Fields that identify an attribute, in order of preference
+ATTRIBUTE_KEY_FIELDS = ('bms_id', 'gdsn_name', 'attribute_name_nl', 'attribute_name_en')
+
+
+def _norm(value: Any) -> Any:
+    return value.strip() if isinstance(value, str) else value
+
+
+def attribute_key(attr: Dict[str, Any]) -> str:
+    for name in ATTRIBUTE_KEY_FIELDS:
+        value = _norm(attr.get(name))
+        if value:
+            return f'{name}:{value}'
+    return ''
+
+
+def index_attributes(attributes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Attributes by key; repeated keys get an occurrence suffix (#2, #3...)."""
+    indexed = {}
+    for attr in attributes:
+        key = base = attribute_key(attr)
+        n = 1
+        while key in indexed:
+            n += 1
+            key = f'{base}#{n}'
+        indexed[key] = attr
+    return indexed
+
+
+def field_changes(old: Dict[str, Any], new: Dict[str, Any], fields: List[str]) -> Dict[str, List[Any]]:
+    """Fields whose (whitespace-stripped) values differ, as {field: [old, new]}."""
+    changes = {}
+    for name in fields:
+        if _norm(old.get(name)) != _norm(new.get(name)):
+            changes[name] = [old.get(name), new.get(name)]
+    return changes
+
+
+def diff_attributes(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Added, removed and modified attributes.
+
+    Only columns both releases have are compared; columns a release adds or
+    drops are reported once as fields_added / fields_removed instead of
+    marking every attribute modified.
+    """
+    old_index, new_index = index_attributes(old), index_attributes(new)
+    old_fields = list(dict.fromkeys(k for attr in old for k in attr))
+    new_fields = list(dict.fromkeys(k for attr in new for k in attr))
+    common = [k for k in new_fields if k in old_fields]
+
+    modified = []
+    for key, attr in new_index.items():
+        if key in old_index:
+            changes = field_changes(old_index[key], attr, common)
+            if changes:
+                modified.append({'key': key, 'attribute': attr, 'changes': changes})
+    return {
+        'fields_added': [k for k in new_fields if k not in old_fields],
+        'fields_removed': [k for k in old_fields if k not in new_fields],
+        'added': [{'key': k, 'attribute': a} for k, a in new_index.items() if k not in old_index],
+        'removed': [{'key': k, 'attribute': a} for k, a in old_index.items() if k not in new_index],
+        'modified': modified,
+    }
+
+
+def index_codes(code_lists: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    return {(cl['name'], code['code']): code for cl in code_lists for code in cl['codes']}
+
+
+def diff_code_lists(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    old_index, new_index = index_codes(old), index_codes(new)
+    old_names = {cl['name'] for cl in old}
+    new_names = {cl['name'] for cl in new}
+
+    def entry(key, code):
+        return {'list': key[0], **code}
+
+    modified = []
+    for key, code in new_index.items():
+        if key in old_index:
+            changes = field_changes(old_index[key], code, ['description_nl', 'description_en'])
+            if changes:
+                modified.append({**entry(key, code), 'changes': changes})
+    return {
+        'lists_added': sorted(new_names - old_names),
+        'lists_removed': sorted(old_names - new_names),
+        'added': [entry(k, c) for k, c in new_index.items() if k not in old_index],
+        'removed': [entry(k, c) for k, c in old_index.items() if k not in new_index],
+        'modified': modified,
+    }
+
+
+def diff_workbooks(old_path: str, new_path: str) -> Dict[str, Any]:
+    old_attributes, old_code_lists = parse_workbook(old_path)
+    new_attributes, new_code_lists = parse_workbook(new_path)
+    return {
+        'old': old_path,
+        'new': new_path,
+        'attributes': diff_attributes(old_attributes, new_attributes),
+        'code_lists': diff_code_lists(old_code_lists, new_code_lists),
+    }
+
+
+def load_release_notes(path: str) -> Dict[str, Any]:
+    """Changes announced in a GS1 Benelux release overview workbook.
+
+    Returns the GDSN names of changed attributes (from '... (gdsnName)' titles
+    on the Attributen sheet), the names of changed code lists (quoted in the
+    Codelijsten sheet titles) and individual code changes from sheets with a
+    'Type Wijziging' / 'Codelijst Naam' / 'Code Waarde' table.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    notes = {'attributes': set(), 'code_lists': set(), 'codes': []}
+    try:
+        if 'Attributen' in wb.sheetnames:
+            for row in wb['Attributen'].iter_rows(min_row=3, max_col=1, values_only=True):
+                match = re.search(r'\(([^()]+)\)\s*$', str(row[0] or ''))
+                if match:
+                    notes['attributes'].add(match.group(1).split('@')[0].strip(' /').lower())
+
+        if 'Codelijsten' in wb.sheetnames:
+            for row in wb['Codelijsten'].iter_rows(min_row=3, max_col=1, values_only=True):
+                match = re.search(r"['‘’]([^'‘’]+)['‘’]", str(row[0] or ''))
+                if match:
+                    notes['code_lists'].add(match.group(1).strip().lower())
+
+        for ws in wb.worksheets:
+            columns = None
+            for row in ws.iter_rows(values_only=True):
+                labels = [str(v).strip().lower() if v is not None else '' for v in row]
+                if columns is None:
+                    if {'type wijziging', 'codelijst naam', 'code waarde'} <= set(labels):
+                        columns = [labels.index(c) for c in ('type wijziging', 'codelijst naam', 'code waarde')]
+                    continue
+                kind, list_name, code = (row[i] if i < len(row) else None for i in columns)
+                if kind and list_name and code is not None:
+                    notes['codes'].append((str(kind).strip().upper(), str(list_name).strip(), str(code).strip()))
+    finally:
+        wb.close()
+    return notes
+
+
+def check_release_notes(diff: Dict[str, Any], notes: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Announced changes the diff does not show."""
+    attrs = diff['attributes']
+    changed_gdsn: Set[str] = {
+        (item['attribute'].get('gdsn_name') or '').strip().lower()
+        for kind in ('added', 'removed', 'modified') for item in attrs[kind]
+    }
+
+    codes = diff['code_lists']
+    changed_lists = {name.lower() for name in codes['lists_added'] + codes['lists_removed']}
+    changed_lists |= {item['list'].lower() for kind in ('added', 'removed', 'modified') for item in codes[kind]}
+    by_kind = {
+        kind: {(item['list'].lower(), str(item['code']).lower()) for item in codes[key]}
+        for kind, key in (('ADD', 'added'), ('CHANGE', 'modified'), ('DELETE', 'removed'))
+    }
+
+    return {
+        'attributes': sorted(notes['attributes'] - changed_gdsn),
+        'code_lists': sorted(notes['code_lists'] - changed_lists),
+        'codes': [c for c in notes['codes']
+                  if (c[1].lower(), c[2].lower()) not in by_kind.get(c[0], set())],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff two GS1 Benelux datamodel releases')
+    parser.add_argument('old', help='Workbook of the previous release')
+    parser.add_argument('new', help='Workbook of the new release')
+    parser.add_argument('--output', help='Write the full diff as JSON to this file')
+    parser.add_argument('--release-notes', help='Release overview workbook to check the diff against')
+    args = parser.parse_args()
+
+    diff = diff_workbooks(args.old, args.new)
+    attrs, codes = diff['attributes'], diff['code_lists']
+
+    print(f"\nDatamodel diff: {args.old} -> {args.new}")
+    print(f"  Attributes: {len(attrs['added'])} added, {len(attrs['removed'])} removed, "
+          f"{len(attrs['modified'])} modified")
+    if attrs['fields_added'] or attrs['fields_removed']:
+        print(f"  Columns: +{attrs['fields_added']} -{attrs['fields_removed']}")
+    print(f"  Code lists: {len(codes['lists_added'])} added, {len(codes['lists_removed'])} removed")
+    print(f"  Codes: {len(codes['added'])} added, {len(codes['removed'])} removed, "
+          f"{len(codes['modified'])} modified")
+    for item in attrs['modified'][:10]:
+        print(f"    ~ {item['key']}: {', '.join(item['changes'])}")
+
+    if args.release_notes:
+        notes = load_release_notes(args.release_notes)
+        missing = check_release_notes(diff, notes)
+        diff['release_notes_missing'] = missing
+        print(f"\nRelease notes: {len(notes['attributes'])} attributes, {len(notes['code_lists'])} code lists, "
+              f"{len(notes['codes'])} code changes announced")
+        print(f"  Not in diff: {len(missing['attributes'])} attributes, {len(missing['code_lists'])} code lists, "
+              f"{len(missing['codes'])} code changes")
+        for name in missing['attributes'][:10]:
+            print(f"    ? attribute {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved diff to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Manage the local embedding cache used by the knowledge_embeddings ingestion scripts.
+
+  python scripts/embedding_cache.py stats
+  python scripts/embedding_cache.py warm [--source-type gs1_nl_datamodel]
+"""
+
+import argparse
+
+from knowledge_ingest import EmbeddingCache, get_db_connection, warm_from_knowledge_embeddings
+from knowledge_ingest.cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_ENTRIES, WARMABLE_SOURCE_TYPES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local embedding cache')
+    parser.add_argument('command', choices=['stats', 'warm'])
+    parser.add_argument('--path', default=DEFAULT_CACHE_PATH, help='Cache file (default: %(default)s)')
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help='LRU size cap (default: %(default)s)')
+    parser.add_argument('--source-type', choices=WARMABLE_SOURCE_TYPES,
+                        help='Only warm from rows of this sourceType (default: all warmable types)')
+    args = parser.parse_args()
+
+    cache = EmbeddingCache(args.path, max_entries=args.max_entries)
+
+    if args.command == 'warm':
+        print("Connecting to database...")
+        conn = get_db_connection()
+        stored = warm_from_knowledge_embeddings(cache, conn, source_type=args.source_type)
+        conn.close()
+        print(f"Stored {stored} vectors from knowledge_embeddings")
+
+    print(f"Cache: {args.path}")
+    print(f"Entries: {len(cache)} (cap {cache.max_entries})")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Shared ingestion engine for the knowledge_embeddings scripts.
+
+Each ingest_*.py script defines a ContentSource adapter for its content JSON
+and hands it to run_ingestion(); batching, dedup, connection handling and
+commit policy live here so they apply to every pipeline.
+"""
+
+from .db import (
+    parse_database_url,
+    get_db_connection,
+    content_hash,
+    get_next_source_id,
+    check_columns,
+    fetch_existing_hashes,
+    insert_knowledge_embedding,
+    KnowledgeEmbeddingWriter,
+    BINARY_VECTOR_COLUMNS,
+)
+from .embeddings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSIONS,
+    estimate_tokens,
+    token_batches,
+    generate_embeddings,
+    embed_items,
+)
+from .chunking import CHUNK_TOKENS, CHUNK_OVERLAP_TOKENS, chunk_text
+from .cache import EmbeddingCache, open_default_cache, warm_from_knowledge_embeddings
+from .local import LocalConnection, LocalEmbeddingClient, hashed_ngram_vector
+from .ratelimit import RateLimitedClient, TokenBucket
+from .checkpoint import Checkpoint, checkpoint_path
+from .sources import ContentSource
+from .vectors import VECTOR_FORMATS, encode_vector, decode_vector
+from .engine import (
+    IngestionStats,
+    create_openai_client,
+    ingest_source,
+    run_ingestion,
+    build_arg_parser,
+    run_cli,
+)
+from .pipeline import ingest_source_async
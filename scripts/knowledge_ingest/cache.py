@@ -0,0 +1,197 @@
+"""
+Persistent content-addressed embedding cache.
+
+Vectors are stored in a local SQLite file keyed by (model, dimensions,
+sha256(text)), so text embedded by any previous run or any other ingestion
+script is never sent to the API again. The cache is capped by entry count
+and evicts least recently used entries.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.path.expanduser(
+    os.environ.get('EMBEDDING_CACHE_PATH', '~/.cache/isa/embedding_cache.sqlite')
+)
+DEFAULT_MAX_ENTRIES = int(os.environ.get('EMBEDDING_CACHE_MAX_ENTRIES', 100000))
+
+# SQLite caps bound parameters per statement; stay well below it
+_LOOKUP_CHUNK = 500
+
+# knowledge_embeddings rows whose stored content is exactly the text that was
+# embedded: those written by adapters that keep ContentSource.embedding_text.
+# Server-written source types embed whitespace-normalised text, and the fashion
+# DPP guidance embeds title + description + content under gs1_nl_datamodel.
+WARMABLE_SOURCE_TYPES = ('gs1_nl_datamodel', 'gs1_nl_codelist')
+UNWARMABLE_DATASETS = ('gs1_nl_fashion_dpp_guidance',)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache with an LRU size cap.
+
+    Safe to share between the worker threads of the async pipeline.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, dimensions, hash)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, dimensions: int, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given text hashes, refreshing their LRU stamp."""
+        with self.lock:
+            return self._get_many(model, dimensions, hashes)
+
+    def put_many(self, model: str, dimensions: int, entries: Iterable[Tuple[str, List[float]]]) -> int:
+        """Store (text hash, vector) pairs, then evict down to the size cap."""
+        with self.lock:
+            return self._put_many(model, dimensions, entries)
+
+    def _get_many(self, model: str, dimensions: int, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        for start in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[start:start + _LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT hash, vector FROM embeddings WHERE model = ? AND dimensions = ? "
+                f"AND hash IN ({', '.join(['?'] * len(chunk))})",
+                (model, dimensions, *chunk)
+            ).fetchall()
+            found.update((hash_val, _unpack(blob)) for hash_val, blob in rows)
+
+        if found:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND dimensions = ? AND hash = ?",
+                [(now, model, dimensions, hash_val) for hash_val in found]
+            )
+            self.conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+
+    def _put_many(self, model: str, dimensions: int, entries: Iterable[Tuple[str, List[float]]]) -> int:
+        now = time.time()
+        rows = [
+            (model, dimensions, hash_val, _pack(vector), now)
+            for hash_val, vector in entries
+            if vector and len(vector) == dimensions
+        ]
+        if not rows:
+            return 0
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, dimensions, hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+        self._evict()
+        return len(rows)
+
+    def _evict(self) -> int:
+        """Drop least recently used entries above max_entries."""
+        excess = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self.conn.commit()
+        return excess
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_default_cache() -> Optional[EmbeddingCache]:
+    """Open the shared cache unless disabled with EMBEDDING_CACHE=off."""
+    if os.environ.get('EMBEDDING_CACHE', '').lower() in ('0', 'off', 'false', 'no'):
+        return None
+    return EmbeddingCache()
+
+
+def warm_from_knowledge_embeddings(cache: EmbeddingCache, conn, source_type: Optional[str] = None,
+                                   fetch_size: int = 1000) -> int:
+    """Pre-warm the cache from vectors already stored in knowledge_embeddings.
+
+    Entries are keyed by the stored content (as truncated for embedding), so
+    only rows of WARMABLE_SOURCE_TYPES outside UNWARMABLE_DATASETS are used:
+    for other rows that key would name text the vector was not computed from.
+    """
+    import json
+
+    from .embeddings import MAX_INPUT_CHARS
+
+    if source_type and source_type not in WARMABLE_SOURCE_TYPES:
+        raise ValueError(f"{source_type} rows were not embedded from their stored content")
+    source_types = (source_type,) if source_type else WARMABLE_SOURCE_TYPES
+    sql = (
+        f"SELECT content, embedding, embeddingModel FROM knowledge_embeddings "
+        f"WHERE sourceType IN ({', '.join(['%s'] * len(source_types))}) "
+        f"AND (datasetId IS NULL OR datasetId NOT IN ({', '.join(['%s'] * len(UNWARMABLE_DATASETS))}))"
+    )
+    params = (*source_types, *UNWARMABLE_DATASETS)
+
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    stored = 0
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        by_key: Dict[Tuple[str, int], List[Tuple[str, List[float]]]] = {}
+        for content, embedding, model in rows:
+            try:
+                vector = json.loads(embedding) if isinstance(embedding, (str, bytes)) else embedding
+            except ValueError:
+                continue
+            if not content or not vector:
+                continue
+            by_key.setdefault((model, len(vector)), []).append((text_hash(content[:MAX_INPUT_CHARS]), vector))
+        for (model, dimensions), entries in by_key.items():
+            stored += cache.put_many(model, dimensions, entries)
+    cursor.close()
+    return stored
@@ -0,0 +1,77 @@
+"""
+Checkpoint journals for resumable ingestion.
+
+Each source file gets an append-only JSONL journal recording the content hash
+and assigned sourceType/sourceId of every row once its transaction has
+committed. `--resume` replays the journal into a set, so items finished by an
+interrupted run are skipped in O(1) without a DB lookup, and sourceIds
+continue after both the journal's and the table's highest id.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Sequence
+
+from .db import KNOWLEDGE_EMBEDDING_COLUMNS
+
+CHECKPOINT_DIR = os.path.expanduser(os.environ.get('INGEST_CHECKPOINT_DIR', '~/.cache/isa/checkpoints'))
+
+_HASH = KNOWLEDGE_EMBEDDING_COLUMNS.index('contentHash')
+_SOURCE_TYPE = KNOWLEDGE_EMBEDDING_COLUMNS.index('sourceType')
+_SOURCE_ID = KNOWLEDGE_EMBEDDING_COLUMNS.index('sourceId')
+
+
+def checkpoint_path(content_path: str, checkpoint_dir: str = CHECKPOINT_DIR) -> str:
+    return os.path.join(checkpoint_dir, f"{os.path.basename(content_path)}.checkpoint.jsonl")
+
+
+class Checkpoint:
+    """Journal of committed rows for one source file.
+
+    Without `resume` any previous journal is discarded and a fresh one is
+    started, so the run can itself be resumed later.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.hashes = set()
+        self.next_source_ids: Dict[str, int] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-write
+                    continue
+                self.hashes.add(entry['hash'])
+                source_type = entry['sourceType']
+                self.next_source_ids[source_type] = max(
+                    self.next_source_ids.get(source_type, 1), entry['sourceId'] + 1
+                )
+
+    def __contains__(self, hash_val: str) -> bool:
+        return hash_val in self.hashes
+
+    def record(self, rows: Iterable[Sequence]) -> None:
+        """Append committed knowledge_embeddings rows (as column-ordered tuples)."""
+        lines = []
+        for row in rows:
+            self.hashes.add(row[_HASH])
+            lines.append(json.dumps({
+                'hash': row[_HASH],
+                'sourceType': row[_SOURCE_TYPE],
+                'sourceId': row[_SOURCE_ID],
+            }) + '\n')
+        self.file.writelines(lines)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,115 @@
+"""
+Heading-aware chunking of long content before embedding.
+
+Content that fits the token budget passes through unchanged, so its hash and
+stored row stay the same. Longer content is split into paragraphs (then
+lines, then words when a single piece is still too long) and packed into
+chunks of at most `max_tokens` estimated tokens. Every chunk starts with the
+document title -- the first line of the content -- and a chunk that begins
+inside a section repeats that section's heading. Consecutive chunks within
+one section share up to `overlap_tokens` of trailing lines.
+"""
+
+import os
+import re
+import textwrap
+from typing import List, NamedTuple, Optional, Sequence
+
+from .embeddings import estimate_tokens
+
+CHUNK_TOKENS = int(os.environ.get('EMBEDDING_CHUNK_TOKENS', 1000))
+CHUNK_OVERLAP_TOKENS = int(os.environ.get('EMBEDDING_CHUNK_OVERLAP_TOKENS', 100))
+
+# Markdown headings and the '**Section**' lines the GS1 NL parsers emit
+_HEADING = re.compile(r'^(#{1,6}\s+\S.*|\*\*[^*]+\*\*:?)\s*$')
+
+# Smallest piece budget, so a very long title cannot force word-by-word splits
+_MIN_PIECE_TOKENS = 32
+
+
+class _Piece(NamedTuple):
+    section: int  # index into the heading list (0: before the first heading)
+    sep: str      # separator that preceded the piece in the original text
+    text: str
+
+
+def _split_piece(piece: _Piece, limit: int) -> List[_Piece]:
+    """Split a piece into lines, then word-wrapped runs, of at most `limit` tokens."""
+    if estimate_tokens(piece.text) <= limit:
+        return [piece]
+    if '\n' in piece.text:
+        pieces = []
+        for i, line in enumerate(piece.text.split('\n')):
+            pieces.extend(_split_piece(piece._replace(sep=piece.sep if i == 0 else '\n', text=line), limit))
+        return pieces
+    runs = textwrap.wrap(piece.text, width=(limit - 1) * 3, break_long_words=True,
+                         break_on_hyphens=False, replace_whitespace=False, drop_whitespace=True)
+    return [piece._replace(sep=piece.sep if i == 0 else ' ', text=run) for i, run in enumerate(runs)]
+
+
+def _render(title: str, headings: Sequence[Optional[str]], pieces: Sequence[_Piece]) -> str:
+    first = pieces[0]
+    heading = headings[first.section]
+    prefix = title + '\n\n'
+    if heading and not first.text.startswith(heading):
+        prefix += heading + '\n'
+    return prefix + first.text + ''.join(p.sep + p.text for p in pieces[1:])
+
+
+def _overlap(pieces: Sequence[_Piece], section: int, overlap_tokens: int) -> List[_Piece]:
+    """Trailing pieces of `section`, within the overlap budget."""
+    carried: List[_Piece] = []
+    budget = overlap_tokens
+    for piece in reversed(pieces):
+        tokens = estimate_tokens(piece.text)
+        if piece.section != section or tokens > budget:
+            break
+        carried.insert(0, piece)
+        budget -= tokens
+    return carried
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS,
+               overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> List[str]:
+    """Split `text` into chunks of at most `max_tokens` estimated tokens."""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    title, _, body = text.partition('\n')
+    headings: List[Optional[str]] = [None]
+    paragraphs: List[_Piece] = []
+    lines: List[str] = []
+
+    def end_paragraph():
+        if lines:
+            paragraphs.append(_Piece(len(headings) - 1, '\n\n', '\n'.join(lines)))
+            lines.clear()
+
+    for line in body.strip('\n').split('\n'):
+        if not line.strip():
+            end_paragraph()
+            continue
+        if _HEADING.match(line):
+            end_paragraph()
+            headings.append(line.strip())
+        lines.append(line)
+    end_paragraph()
+
+    pieces: List[_Piece] = []
+    for paragraph in paragraphs:
+        heading = headings[paragraph.section] or ''
+        limit = max(max_tokens - overlap_tokens - estimate_tokens(f'{title}\n\n{heading}\n'), _MIN_PIECE_TOKENS)
+        pieces.extend(_split_piece(paragraph, limit))
+
+    chunks: List[str] = []
+    current: List[_Piece] = []
+    for piece in pieces:
+        if current and estimate_tokens(_render(title, headings, current + [piece])) > max_tokens:
+            chunks.append(_render(title, headings, current))
+            current = _overlap(current, piece.section, overlap_tokens)
+            if current and estimate_tokens(_render(title, headings, current + [piece])) > max_tokens:
+                current = []
+        current.append(piece)
+    if current:
+        chunks.append(_render(title, headings, current))
+    return chunks
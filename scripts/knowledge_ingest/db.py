@@ -0,0 +1,220 @@
+"""
+MySQL/TiDB access for the knowledge_embeddings table.
+"""
+
+import hashlib
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+from urllib.parse import urlparse
+
+DATABASE_URL = os.environ.get('DATABASE_URL', '')
+
+KNOWLEDGE_EMBEDDING_COLUMNS = (
+    'sourceType', 'sourceId', 'content', 'contentHash', 'embedding', 'embeddingModel',
+    'title', 'url', 'datasetId', 'datasetVersion', 'lastVerifiedDate', 'isDeprecated',
+    'authority_level', 'legal_status', 'source_authority', 'semantic_layer',
+    'document_type', 'confidence_score', 'createdAt', 'updatedAt',
+    # Requires drizzle/migrations/0026_add_knowledge_embedding_chunk_index.sql
+    'chunk_index',
+)
+
+# Requires drizzle/migrations/0025_add_knowledge_embedding_vector_blob.sql
+BINARY_VECTOR_COLUMNS = KNOWLEDGE_EMBEDDING_COLUMNS + ('embedding_vector',)
+
+# Columns added by migrations the ingestion depends on
+COLUMN_MIGRATIONS = {
+    'embedding_vector': 'drizzle/migrations/0025_add_knowledge_embedding_vector_blob.sql',
+    'chunk_index': 'drizzle/migrations/0026_add_knowledge_embedding_chunk_index.sql',
+}
+
+
+def insert_sql(columns: Sequence[str] = KNOWLEDGE_EMBEDDING_COLUMNS) -> str:
+    return (
+        f"INSERT INTO knowledge_embeddings ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+
+
+INSERT_KNOWLEDGE_EMBEDDING_SQL = insert_sql()
+
+
+def parse_database_url(url: str) -> Optional[dict]:
+    """Parse MySQL connection URL."""
+    try:
+        parsed = urlparse(url)
+        if not parsed.hostname:
+            return None
+        return {
+            'user': parsed.username,
+            'password': parsed.password,
+            'host': parsed.hostname,
+            'port': parsed.port or 4000,
+            'database': parsed.path.lstrip('/').split('?')[0],
+            'ssl_disabled': False
+        }
+    except ValueError:
+        return None
+
+
+def get_db_connection(url: Optional[str] = None):
+    """Get database connection."""
+    import mysql.connector
+
+    config = parse_database_url(url or DATABASE_URL)
+    if not config:
+        raise ValueError("Invalid DATABASE_URL")
+
+    return mysql.connector.connect(**config)
+
+
+def content_hash(content: str) -> str:
+    """Generate hash for content deduplication."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def get_next_source_id(cursor, source_type: str) -> int:
+    """Get the next available sourceId for a given sourceType."""
+    cursor.execute(
+        "SELECT COALESCE(MAX(sourceId), 0) + 1 FROM knowledge_embeddings WHERE sourceType = %s",
+        (source_type,)
+    )
+    result = cursor.fetchone()
+    return result[0] if result else 1
+
+
+def check_columns(cursor, columns: Sequence[str] = KNOWLEDGE_EMBEDDING_COLUMNS) -> None:
+    """Fail fast if knowledge_embeddings lacks any of `columns`, naming the migration to apply."""
+    cursor.execute("SELECT * FROM knowledge_embeddings LIMIT 0")
+    cursor.fetchall()
+    existing = {description[0] for description in cursor.description}
+    missing = [column for column in columns if column not in existing]
+    if missing:
+        migrations = sorted({COLUMN_MIGRATIONS.get(column, 'the pending migrations') for column in missing})
+        raise RuntimeError(f"knowledge_embeddings is missing {', '.join(missing)}; apply {', '.join(migrations)}")
+
+
+def fetch_existing_hashes(cursor, hashes: Iterable[str], chunk_size: int = 1000) -> Set[str]:
+    """Return the subset of `hashes` already stored, querying in IN (...) chunks."""
+    hashes = list(dict.fromkeys(hashes))
+    existing = set()
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start:start + chunk_size]
+        cursor.execute(
+            f"SELECT contentHash FROM knowledge_embeddings WHERE contentHash IN ({', '.join(['%s'] * len(chunk))})",
+            tuple(chunk)
+        )
+        existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def fetch_source_ids(cursor, hashes: Iterable[str], chunk_size: int = 1000) -> Dict[str, int]:
+    """Map the stored `hashes` to their sourceId, querying in IN (...) chunks."""
+    hashes = list(dict.fromkeys(hashes))
+    source_ids = {}
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start:start + chunk_size]
+        cursor.execute(
+            f"SELECT contentHash, sourceId FROM knowledge_embeddings "
+            f"WHERE contentHash IN ({', '.join(['%s'] * len(chunk))})",
+            tuple(chunk)
+        )
+        source_ids.update(cursor.fetchall())
+    return source_ids
+
+
+def deprecate_rows(conn, hashes: Iterable[str], chunk_size: int = 1000) -> int:
+    """Mark the rows with the given content hashes as deprecated; returns the rows changed."""
+    hashes = list(dict.fromkeys(hashes))
+    cursor = conn.cursor()
+    changed = 0
+    try:
+        for start in range(0, len(hashes), chunk_size):
+            chunk = hashes[start:start + chunk_size]
+            cursor.execute(
+                f"UPDATE knowledge_embeddings SET isDeprecated = 1 "
+                f"WHERE isDeprecated = 0 AND contentHash IN ({', '.join(['%s'] * len(chunk))})",
+                tuple(chunk)
+            )
+            changed += cursor.rowcount
+        conn.commit()
+    finally:
+        cursor.close()
+    return changed
+
+
+def insert_knowledge_embedding(cursor, row: Dict[str, Any]) -> None:
+    """Insert one knowledge_embeddings row given as a column -> value dict."""
+    cursor.execute(
+        INSERT_KNOWLEDGE_EMBEDDING_SQL,
+        tuple(row.get(column) for column in KNOWLEDGE_EMBEDDING_COLUMNS)
+    )
+
+
+FLUSH_SIZE = int(os.environ.get('INGEST_FLUSH_SIZE', 500))
+
+
+class KnowledgeEmbeddingWriter:
+    """Buffered bulk writer for knowledge_embeddings rows.
+
+    Rows are flushed with one multi-row `executemany` INSERT and one commit
+    per `flush_size` rows. If a flush fails it is rolled back and retried row
+    by row, so a single bad row only costs itself. `on_commit` receives the
+    rows (column-ordered tuples) of every committed transaction. Pass
+    BINARY_VECTOR_COLUMNS as `columns` to also write `embedding_vector`.
+    """
+
+    def __init__(self, conn, flush_size: int = FLUSH_SIZE,
+                 on_commit: Optional[Callable[[List[tuple]], None]] = None,
+                 columns: Sequence[str] = KNOWLEDGE_EMBEDDING_COLUMNS):
+        self.conn = conn
+        self.flush_size = flush_size
+        self.on_commit = on_commit
+        self.columns = tuple(columns)
+        self.sql = insert_sql(self.columns)
+        self.cursor = conn.cursor()
+        self.buffer = []
+        self.inserted = 0
+        self.failed = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.buffer.append(tuple(row.get(column) for column in self.columns))
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        try:
+            self.cursor.executemany(self.sql, rows)
+            self.conn.commit()
+        except Exception as e:
+            print(f"  Bulk insert of {len(rows)} rows failed ({str(e)[:100]}), retrying row by row")
+            self.conn.rollback()
+            rows = self._insert_one_by_one(rows)
+
+        self.inserted += len(rows)
+        if self.on_commit and rows:
+            self.on_commit(rows)
+
+    def _insert_one_by_one(self, rows: List[tuple]) -> List[tuple]:
+        inserted = []
+        for values in rows:
+            try:
+                self.cursor.execute(self.sql, values)
+                inserted.append(values)
+            except Exception as e:
+                print(f"  Error inserting row: {str(e)[:100]}")
+                self.failed += 1
+        self.conn.commit()
+        return inserted
+
+    def close(self) -> None:
+        self.flush()
+        self.cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
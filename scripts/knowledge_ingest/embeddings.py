@@ -0,0 +1,126 @@
+"""
+Batched embedding generation for knowledge_embeddings ingestion.
+
+Inputs are packed into as few `client.embeddings.create` calls as possible,
+bounded by an estimated token budget rather than a fixed item count, and the
+returned vectors are mapped back to their inputs by response index.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import EmbeddingCache, text_hash
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+
+# Per-input character cap; a safety net, since long content is chunked below it (chunking.py)
+MAX_INPUT_CHARS = 8000
+
+# Per-request limits; the API allows 2048 inputs and ~300k tokens per call
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = int(os.environ.get('EMBEDDING_BATCH_TOKENS', 100000))
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate (~3 chars per token for NL/EN markdown)."""
+    return len(text) // 3 + 1
+
+
+def token_batches(texts: List[str], max_tokens: int = MAX_BATCH_TOKENS,
+                  max_inputs: int = MAX_BATCH_INPUTS) -> Iterator[List[int]]:
+    """Yield lists of indices into `texts`, each within the token budget."""
+    batch = []
+    batch_tokens = 0
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        tokens = estimate_tokens(text[:MAX_INPUT_CHARS])
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_inputs):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def generate_embeddings(client, texts: List[str], model: str = EMBEDDING_MODEL,
+                        max_tokens: int = MAX_BATCH_TOKENS,
+                        cache: Optional[EmbeddingCache] = None) -> List[Optional[List[float]]]:
+    """Embed many texts with batched API calls.
+
+    Returns one entry per input, in input order. Empty inputs and inputs whose
+    batch failed are returned as None. With a cache, only cache misses are
+    sent to the API and fresh vectors are written back.
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    texts = [(text or '')[:MAX_INPUT_CHARS] for text in texts]
+
+    if cache is not None:
+        hashes = [text_hash(text) for text in texts]
+        cached = cache.get_many(model, EMBEDDING_DIMENSIONS, (h for h, t in zip(hashes, texts) if t))
+        for i, hash_val in enumerate(hashes):
+            if texts[i] and hash_val in cached:
+                results[i] = cached[hash_val]
+        pending = [i for i, text in enumerate(texts) if text and results[i] is None]
+    else:
+        pending = [i for i, text in enumerate(texts) if text]
+
+    for batch in token_batches([texts[i] for i in pending], max_tokens=max_tokens):
+        batch = [pending[j] for j in batch]
+        try:
+            response = client.embeddings.create(
+                model=model,
+                input=[texts[i] for i in batch],
+                dimensions=EMBEDDING_DIMENSIONS
+            )
+        except Exception as e:
+            print(f"Error generating embeddings for batch of {len(batch)}: {str(e)[:100]}")
+            continue
+
+        for data in response.data:
+            results[batch[data.index]] = data.embedding
+
+        if cache is not None:
+            cache.put_many(model, EMBEDDING_DIMENSIONS, ((hashes[i], results[i]) for i in batch))
+
+    return results
+
+
+def embed_items(client, items: Iterable[Dict[str, Any]],
+                text_fn: Optional[Callable[[Dict[str, Any]], str]] = None,
+                model: str = EMBEDDING_MODEL,
+                max_tokens: int = MAX_BATCH_TOKENS,
+                cache: Optional[EmbeddingCache] = None) -> Iterator[Tuple[Dict[str, Any], Optional[List[float]]]]:
+    """Yield (item, embedding) pairs, embedding one token-budgeted batch at a time.
+
+    Only one batch of vectors is held in memory, so arbitrarily large content
+    files can be streamed through. `text_fn` selects the text to embed for an
+    item and defaults to its 'content' field.
+    """
+    text_fn = text_fn or (lambda item: item.get('content') or '')
+    pending: List[Dict[str, Any]] = []
+    pending_tokens = 0
+
+    for item in items:
+        tokens = estimate_tokens(text_fn(item)[:MAX_INPUT_CHARS])
+        if pending and (pending_tokens + tokens > max_tokens or len(pending) >= MAX_BATCH_INPUTS):
+            yield from _embed_pending(client, pending, text_fn, model, max_tokens, cache)
+            pending = []
+            pending_tokens = 0
+        pending.append(item)
+        pending_tokens += tokens
+
+    if pending:
+        yield from _embed_pending(client, pending, text_fn, model, max_tokens, cache)
+
+
+def _embed_pending(client, pending: List[Dict[str, Any]], text_fn: Callable[[Dict[str, Any]], str], model: str,
+                   max_tokens: int, cache: Optional[EmbeddingCache]) -> Iterator[Tuple[Dict[str, Any], Optional[List[float]]]]:
+    embeddings = generate_embeddings(
+        client, [text_fn(item) for item in pending],
+        model=model, max_tokens=max_tokens, cache=cache
+    )
+    return zip(pending, embeddings)
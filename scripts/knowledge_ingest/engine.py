@@ -0,0 +1,420 @@
+"""
+Ingestion engine: runs source adapters into knowledge_embeddings.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from .cache import EmbeddingCache, open_default_cache
+from .checkpoint import CHECKPOINT_DIR, Checkpoint, checkpoint_path
+from .db import (
+    BINARY_VECTOR_COLUMNS, FLUSH_SIZE, KNOWLEDGE_EMBEDDING_COLUMNS, KnowledgeEmbeddingWriter, check_columns,
+    content_hash, deprecate_rows, fetch_existing_hashes, fetch_source_ids, get_db_connection, get_next_source_id,
+)
+from .embeddings import MAX_BATCH_TOKENS, embed_items
+from .local import LOCAL_DB_PATH, LocalConnection, LocalEmbeddingClient
+from .ratelimit import EMBEDDING_RPM, EMBEDDING_TPM, RateLimitedClient
+from .sources import ContentSource
+from .vectors import VECTOR_FORMATS, encode_vector
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+EMBEDDING_CONCURRENCY = int(os.environ.get('EMBEDDING_CONCURRENCY', 4))
+# 'json' writes the JSON text column only; f32/f16/int8 also write the binary embedding_vector
+# column, which server/embedding-vector.ts decodes in preference to the JSON. The JSON is
+# always kept as the fallback for readers that do not decode the blob.
+VECTOR_FORMAT = os.environ.get('EMBEDDING_VECTOR_FORMAT', 'json')
+
+
+@dataclass
+class IngestionStats:
+    inserted: int = 0
+    skipped: int = 0
+    errors: int = 0
+
+    def add(self, other: 'IngestionStats') -> None:
+        self.inserted += other.inserted
+        self.skipped += other.skipped
+        self.errors += other.errors
+
+
+def create_openai_client():
+    """OpenAI client, honouring OPENAI_API_BASE when it is a URL.
+
+    SDK retries are disabled; RateLimitedClient owns retry and backoff.
+    """
+    from openai import OpenAI
+
+    base_url = os.environ.get('OPENAI_API_BASE')
+    if base_url and base_url.startswith('http'):
+        return OpenAI(base_url=base_url, max_retries=0)
+    return OpenAI(max_retries=0)
+
+
+# Items hashed and checked against the database per round trip while scanning a source
+DEDUP_CHUNK_SIZE = 1000
+
+
+class NewItems:
+    """The items of a source selected for embedding, re-read lazily from its file.
+
+    Only the positions of selected items are held; iterating streams the file
+    again and yields just those, so memory stays flat regardless of file size.
+    For items split into chunks (keyed by `chunk_of`) it also carries the
+    sourceId of chunks already stored, the number of chunks still to store, and
+    which items have an older unsplit row that the chunks supersede.
+    """
+
+    def __init__(self, source: ContentSource, positions: Set[int],
+                 item_source_ids: Optional[Dict[str, int]] = None,
+                 pending_chunks: Optional[Dict[str, int]] = None,
+                 superseded: Optional[Set[str]] = None):
+        self.source = source
+        self.positions = positions
+        self.item_source_ids = item_source_ids or {}
+        self.pending_chunks = pending_chunks or {}
+        self.superseded = superseded or set()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.positions:
+            return
+        remaining = len(self.positions)
+        for position, item in enumerate(self.source.iter_chunks()):
+            if position in self.positions:
+                yield item
+                remaining -= 1
+                if not remaining:
+                    return
+
+
+def select_new_items(source: ContentSource, cursor, stats: IngestionStats,
+                     checkpoint: Optional[Checkpoint] = None,
+                     chunk_size: int = DEDUP_CHUNK_SIZE) -> NewItems:
+    """Scan a source and select the items whose content is not stored yet.
+
+    Dedup happens up front so known content is never sent to the embedding API.
+    Items in the checkpoint journal are skipped without touching the database.
+    The scan streams the file in chunks of `chunk_size`, keeping only hashes.
+    Long items are split first, so each content chunk is deduped on its own.
+    """
+    positions: Set[int] = set()
+    selected: Set[str] = set()
+    # Per split item: one chunk hash already stored, and the count of chunks to store
+    stored_chunks: Dict[str, str] = {}
+    pending_chunks: Dict[str, int] = {}
+    split_items: Set[str] = set()
+    loaded = resumed = 0
+
+    items = enumerate(source.iter_chunks())
+    while True:
+        chunk = [(position, content_hash(source.content(item)), item.get('chunk_of'))
+                 for position, item in islice(items, chunk_size)]
+        if not chunk:
+            break
+        loaded += len(chunk)
+
+        if checkpoint is not None and checkpoint.hashes:
+            pending = [entry for entry in chunk if entry[1] not in checkpoint]
+            resumed += len(chunk) - len(pending)
+        else:
+            pending = chunk
+
+        seen = fetch_existing_hashes(cursor, (h for _, h, _ in pending))
+        for position, hash_val, _ in pending:
+            if hash_val in seen or hash_val in selected:
+                stats.skipped += 1
+            else:
+                selected.add(hash_val)
+                positions.add(position)
+
+        for position, hash_val, item_hash in chunk:
+            if item_hash is None:
+                continue
+            split_items.add(item_hash)
+            if position in positions:
+                pending_chunks[item_hash] = pending_chunks.get(item_hash, 0) + 1
+            elif hash_val in seen or (checkpoint is not None and hash_val in checkpoint):
+                stored_chunks.setdefault(item_hash, hash_val)
+
+    # Rows that hold a split item's whole content, from before it was chunked
+    superseded = fetch_existing_hashes(cursor, split_items)
+    # New chunks take the sourceId of the item's stored chunks, else of its unsplit row
+    known = {item_hash: stored_chunks.get(item_hash, item_hash) for item_hash in pending_chunks
+             if item_hash in stored_chunks or item_hash in superseded}
+    stored_ids = fetch_source_ids(cursor, known.values())
+    item_source_ids = {item_hash: stored_ids[h] for item_hash, h in known.items() if h in stored_ids}
+
+    print(f"Loaded {loaded} items from {source.resolved_path()}")
+    stats.skipped += resumed
+    if resumed:
+        print(f"  Resuming: {resumed} items already in checkpoint {checkpoint.path}")
+
+    print(f"  Skipping {stats.skipped} known items, {len(positions)} to embed")
+    return NewItems(source, positions, item_source_ids, pending_chunks, superseded)
+
+
+class RowSink:
+    """Assigns sourceIds and feeds embedded items to a bulk writer.
+
+    All chunks of a split item share one sourceId: the stored one from
+    `selection` if an earlier run wrote part of the item, else the first id
+    handed out to any of its chunks, so batch order does not matter. On close,
+    unsplit rows superseded by a now fully stored item are deprecated.
+    """
+
+    def __init__(self, source: ContentSource, conn, stats: IngestionStats, total: int,
+                 flush_size: int = FLUSH_SIZE, checkpoint: Optional[Checkpoint] = None,
+                 vector_format: str = VECTOR_FORMAT, selection: Optional[NewItems] = None):
+        self.source = source
+        self.stats = stats
+        self.total = total
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.checkpoint = checkpoint
+        self.vector_format = vector_format
+        self.writer = KnowledgeEmbeddingWriter(
+            conn, flush_size=flush_size, on_commit=checkpoint.record if checkpoint else None,
+            columns=KNOWLEDGE_EMBEDDING_COLUMNS if vector_format == 'json' else BINARY_VECTOR_COLUMNS
+        )
+        # A resumed run continues after the sourceIds it already handed out
+        self.resumed_source_ids: Dict[str, int] = dict(checkpoint.next_source_ids) if checkpoint else {}
+        self.source_ids: Dict[str, int] = {}
+        self.item_source_ids: Dict[str, int] = dict(selection.item_source_ids) if selection else {}
+        self.pending_chunks: Dict[str, int] = dict(selection.pending_chunks) if selection else {}
+        self.superseded: Set[str] = selection.superseded if selection else set()
+        self.count = 0
+
+    def write(self, item: Dict, embedding: Optional[List[float]]) -> None:
+        self.count += 1
+        if not embedding:
+            # Never store a row without a vector; the next run will retry it
+            print(f"  No embedding for item {self.count - 1} ({item.get('title', '')[:50]}), not stored")
+            self.stats.errors += 1
+            return
+        try:
+            source_type = self.source.source_type(item)
+            if source_type not in self.source_ids:
+                # Other scripts share sourceTypes, so they may have used ids since the journal was written
+                self.source_ids[source_type] = max(get_next_source_id(self.cursor, source_type),
+                                                   self.resumed_source_ids.get(source_type, 1))
+                print(f"  Starting sourceId for {source_type}: {self.source_ids[source_type]}")
+
+            item_hash = item.get('chunk_of')
+            source_id = self.item_source_ids.get(item_hash) if item_hash else None
+            new_id = source_id is None
+            if new_id:
+                source_id = self.source_ids[source_type]
+
+            row = self.source.build_row(item, source_id, embedding)
+            if self.vector_format != 'json':
+                row['embedding_vector'] = encode_vector(embedding, self.vector_format)
+            self.writer.add(row)
+            if new_id:
+                self.source_ids[source_type] += 1
+            if item_hash:
+                self.item_source_ids[item_hash] = source_id
+                self.pending_chunks[item_hash] -= 1
+
+            if self.count % self.writer.flush_size == 0:
+                print(f"  Progress: {self.count}/{self.total} "
+                      f"(inserted: {self.writer.inserted}, skipped: {self.stats.skipped})")
+
+        except Exception as e:
+            print(f"  Error at item {self.count - 1} ({item.get('title', '')[:50]}): {e}")
+            self.stats.errors += 1
+
+    def close(self) -> None:
+        self.writer.close()
+        self.cursor.close()
+        complete = [h for h in self.superseded if not self.pending_chunks.get(h)]
+        if complete and not self.writer.failed:
+            deprecated = deprecate_rows(self.conn, complete)
+            if deprecated:
+                print(f"  Deprecated {deprecated} unsplit rows superseded by chunks")
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        self.stats.inserted += self.writer.inserted
+        self.stats.errors += self.writer.failed
+
+
+def ingest_source(source: ContentSource, client, conn, flush_size: int = FLUSH_SIZE,
+                  max_tokens: int = MAX_BATCH_TOKENS,
+                  cache: Optional[EmbeddingCache] = None,
+                  resume: bool = False,
+                  vector_format: str = VECTOR_FORMAT,
+                  checkpoint_dir: str = CHECKPOINT_DIR) -> IngestionStats:
+    """Embed and bulk-insert every new item of one source, one transaction per `flush_size` rows."""
+    stats = IngestionStats()
+    checkpoint = Checkpoint(checkpoint_path(source.content_path, checkpoint_dir), resume=resume)
+    cursor = conn.cursor()
+    items = select_new_items(source, cursor, stats, checkpoint)
+    cursor.close()
+
+    sink = RowSink(source, conn, stats, len(items), flush_size=flush_size, checkpoint=checkpoint,
+                   vector_format=vector_format, selection=items)
+    try:
+        for item, embedding in embed_items(client, items, text_fn=source.embedding_text,
+                                           max_tokens=max_tokens, cache=cache):
+            sink.write(item, embedding)
+    finally:
+        sink.close()
+    return stats
+
+
+def run_ingestion(sources: Sequence[ContentSource], client=None, conn=None,
+                  flush_size: int = FLUSH_SIZE,
+                  max_tokens: int = MAX_BATCH_TOKENS,
+                  cache: Optional[EmbeddingCache] = None,
+                  use_cache: bool = True,
+                  concurrency: int = 1,
+                  rpm: int = EMBEDDING_RPM,
+                  tpm: int = EMBEDDING_TPM,
+                  resume: bool = False,
+                  vector_format: str = VECTOR_FORMAT,
+                  checkpoint_dir: str = CHECKPOINT_DIR) -> IngestionStats:
+    """Ingest several sources over one client and one connection, printing a summary.
+
+    Embeddings go through the shared on-disk cache unless `cache` is given or
+    EMBEDDING_CACHE=off is set. With `concurrency` > 1 each source runs through
+    the async pipeline, embedding that many batches in parallel with the writer.
+    Every embedding request is held to `rpm`/`tpm` and retried on 429s and
+    transient errors. Committed rows are journalled per source file; `resume`
+    continues from those journals instead of starting over. `vector_format`
+    selects JSON text or a packed binary encoding for the stored vectors.
+    """
+    client = RateLimitedClient(client or create_openai_client(), rpm=rpm, tpm=tpm,
+                               max_concurrency=max(concurrency, 1))
+    own_cache = cache is None and use_cache
+    if own_cache:
+        cache = open_default_cache()
+
+    own_conn = conn is None
+    if own_conn:
+        print("Connecting to database...")
+        conn = get_db_connection()
+
+    total = IngestionStats()
+    started = time.monotonic()
+    try:
+        # A missing migration would otherwise only surface at the first flush, after paying for embeddings
+        cursor = conn.cursor()
+        try:
+            check_columns(cursor, KNOWLEDGE_EMBEDDING_COLUMNS if vector_format == 'json' else BINARY_VECTOR_COLUMNS)
+        finally:
+            cursor.close()
+        for source in sources:
+            print(f"\n=== Processing {source.name} ===")
+            if source.resolved_path() is None:
+                print(f"Content file not found, skipping: {source.content_path}")
+                continue
+            if concurrency > 1:
+                from .pipeline import ingest_source_async
+
+                stats = asyncio.run(ingest_source_async(
+                    source, client, conn, concurrency=concurrency,
+                    flush_size=flush_size, max_tokens=max_tokens, cache=cache, resume=resume,
+                    vector_format=vector_format, checkpoint_dir=checkpoint_dir
+                ))
+            else:
+                stats = ingest_source(source, client, conn, flush_size=flush_size,
+                                      max_tokens=max_tokens, cache=cache, resume=resume,
+                                      vector_format=vector_format, checkpoint_dir=checkpoint_dir)
+            print(f"{source.name}: Inserted {stats.inserted}, Skipped {stats.skipped}, Errors {stats.errors}")
+            total.add(stats)
+    finally:
+        if own_conn:
+            conn.close()
+        if own_cache and cache is not None:
+            cache.close()
+
+    print("\n=== Summary ===")
+    print(f"Inserted: {total.inserted}")
+    print(f"Skipped (duplicates): {total.skipped}")
+    print(f"Errors: {total.errors}")
+    elapsed = time.monotonic() - started
+    print(f"Elapsed: {elapsed:.1f}s ({total.inserted / elapsed if elapsed else 0:.0f} rows/s, "
+          f"{client.requests_sent} embedding requests)")
+    if resource is not None:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"Peak RSS: {peak / (1024 * 1024 if sys.platform == 'darwin' else 1024):.0f} MB")
+    if cache is not None:
+        print(f"Embedding cache: {cache.hits} hits, {cache.misses} misses ({cache.path})")
+    if client.retries:
+        print(f"Embedding retries: {client.retries} ({client.throttled} rate limited)")
+    return total
+
+
+def build_arg_parser(description: Optional[str] = None) -> argparse.ArgumentParser:
+    """Command-line options shared by the ingest_*.py scripts."""
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=EMBEDDING_CONCURRENCY,
+                        help='Embedding batches in flight; 1 runs sequentially (default: %(default)s)')
+    parser.add_argument('--flush-size', type=int, default=FLUSH_SIZE,
+                        help='Rows per bulk INSERT/commit (default: %(default)s)')
+    parser.add_argument('--batch-tokens', type=int, default=MAX_BATCH_TOKENS,
+                        help='Estimated tokens per embedding request (default: %(default)s)')
+    parser.add_argument('--rpm', type=int, default=EMBEDDING_RPM,
+                        help='Embedding requests per minute (default: %(default)s)')
+    parser.add_argument('--tpm', type=int, default=EMBEDDING_TPM,
+                        help='Embedding tokens per minute (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the local embedding cache')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from its checkpoint journals')
+    parser.add_argument('--vector-format', choices=['json', *VECTOR_FORMATS], default=VECTOR_FORMAT,
+                        help='Embedding storage: JSON text, or JSON plus binary embedding_vector (default: %(default)s)')
+    parser.add_argument('--backend', choices=['live', 'local'], default='live',
+                        help='live: OpenAI + DATABASE_URL; local: deterministic hashed n-gram '
+                             'embedder + SQLite, no network (default: %(default)s)')
+    parser.add_argument('--local-db', default=LOCAL_DB_PATH,
+                        help='SQLite file for --backend local (default: %(default)s)')
+    parser.add_argument('--local-latency', type=float, default=0.0,
+                        help='Simulated seconds per embedding request for --backend local')
+    return parser
+
+
+def run_cli(sources: Sequence[ContentSource], description: Optional[str] = None) -> IngestionStats:
+    """Parse the shared options and run the given sources."""
+    args = build_arg_parser(description).parse_args()
+
+    client = conn = None
+    checkpoint_dir = CHECKPOINT_DIR
+    if args.backend == 'local':
+        print(f"Local backend: hashed n-gram embeddings, SQLite at {args.local_db}")
+        client = LocalEmbeddingClient(latency=args.local_latency)
+        conn = LocalConnection(args.local_db)
+        # Keep stand-in vectors out of the shared cache and real runs' journals
+        args.no_cache = True
+        checkpoint_dir = os.path.join(CHECKPOINT_DIR, 'local')
+
+    try:
+        return run_ingestion(
+            sources,
+            client=client,
+            conn=conn,
+            flush_size=args.flush_size,
+            max_tokens=args.batch_tokens,
+            use_cache=not args.no_cache,
+            concurrency=args.concurrency,
+            rpm=args.rpm,
+            tpm=args.tpm,
+            resume=args.resume,
+            vector_format=args.vector_format,
+            checkpoint_dir=checkpoint_dir,
+        )
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,156 @@
+"""
+Local stand-ins for the OpenAI API and the MySQL knowledge_embeddings table.
+
+`--backend local` runs the full ingestion pipeline (batching, dedup, bulk
+writes, checkpoints, async stages) with no network and no credentials:
+
+- LocalEmbeddingClient embeds text deterministically by hashing character
+  n-grams into a fixed number of buckets (the "hashing trick"), so equal text
+  always yields equal vectors and similar text yields similar ones.
+- LocalConnection wraps an SQLite file behind the small subset of the
+  mysql-connector API the engine uses (%s placeholders, cursors, commit).
+
+Optional per-request latency makes batching and concurrency behaviour
+measurable on a laptop or in CI.
+"""
+
+import math
+import os
+import sqlite3
+import time
+import zlib
+from array import array
+from types import SimpleNamespace
+from typing import List, Optional
+
+from .embeddings import EMBEDDING_DIMENSIONS
+
+LOCAL_DB_PATH = os.path.expanduser('~/.cache/isa/local_knowledge_embeddings.sqlite')
+NGRAM_SIZES = (3, 4, 5)
+
+
+def hashed_ngram_vector(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    """L2-normalised bag of hashed character n-grams."""
+    vector = array('f', bytes(4 * dimensions))
+    text = f" {text.lower()} "
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            h = zlib.crc32(text[i:i + n].encode('utf-8'))
+            # Low bits pick the bucket, one high bit the sign
+            vector[h % dimensions] += 1.0 if h & 0x80000000 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class LocalEmbeddingClient:
+    """Drop-in for `OpenAI().embeddings` backed by hashed_ngram_vector()."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.embeddings = self
+
+    def create(self, model: str, input, dimensions: Optional[int] = None, **kwargs):
+        inputs = [input] if isinstance(input, str) else list(input)
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        dims = dimensions or EMBEDDING_DIMENSIONS
+        return SimpleNamespace(
+            model=model,
+            data=[SimpleNamespace(index=i, embedding=hashed_ngram_vector(text, dims))
+                  for i, text in enumerate(inputs)]
+        )
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS knowledge_embeddings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sourceType TEXT NOT NULL,
+    sourceId INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    contentHash TEXT NOT NULL,
+    embedding TEXT NOT NULL,
+    embedding_vector BLOB,
+    embeddingModel TEXT,
+    title TEXT NOT NULL,
+    url TEXT,
+    datasetId TEXT,
+    datasetVersion TEXT,
+    source_chunk_id INTEGER,
+    chunk_index INTEGER NOT NULL DEFAULT 0,
+    lastVerifiedDate TEXT,
+    isDeprecated INTEGER DEFAULT 0,
+    authority_level TEXT,
+    legal_status TEXT,
+    source_authority TEXT,
+    semantic_layer TEXT,
+    document_type TEXT,
+    confidence_score REAL,
+    createdAt TEXT,
+    updatedAt TEXT
+);
+CREATE INDEX IF NOT EXISTS content_hash_idx ON knowledge_embeddings (contentHash);
+CREATE INDEX IF NOT EXISTS source_composite_idx ON knowledge_embeddings (sourceType, sourceId);
+"""
+
+
+class LocalCursor:
+    """mysql-connector style cursor over sqlite3 (%s placeholders)."""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self.cursor = cursor
+
+    def execute(self, sql: str, params=()):
+        self.cursor.execute(sql.replace('%s', '?'), tuple(params))
+
+    def executemany(self, sql: str, seq_params):
+        self.cursor.executemany(sql.replace('%s', '?'), [tuple(p) for p in seq_params])
+
+    @property
+    def rowcount(self) -> int:
+        return self.cursor.rowcount
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def fetchmany(self, size: int):
+        return self.cursor.fetchmany(size)
+
+    def close(self):
+        self.cursor.close()
+
+
+class LocalConnection:
+    """SQLite-backed knowledge_embeddings table with a mysql-connector style API."""
+
+    def __init__(self, path: str = LOCAL_DB_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The async pipeline hands the connection between worker threads (never concurrently)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(knowledge_embeddings)')}
+        if 'chunk_index' not in columns:
+            # Local databases created before chunking
+            self.conn.execute('ALTER TABLE knowledge_embeddings ADD COLUMN chunk_index INTEGER NOT NULL DEFAULT 0')
+
+    def cursor(self) -> LocalCursor:
+        return LocalCursor(self.conn.cursor())
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
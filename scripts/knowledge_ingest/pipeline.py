@@ -0,0 +1,87 @@
+"""
+Async ingestion pipeline: concurrent embedding stage feeding a DB writer stage.
+
+Token-budgeted batches are embedded in worker threads, at most `concurrency`
+at a time (the asyncio.Semaphore pattern from ingest-off-parallel.py), while a
+single writer coroutine drains a bounded queue into the bulk writer. When the
+writer falls behind the queue fills up and the embedding stage waits, so
+memory stays bounded and throughput is set by the API rate limit rather than
+by per-request latency.
+"""
+
+import asyncio
+from typing import List, Optional
+
+from .cache import EmbeddingCache
+from .checkpoint import CHECKPOINT_DIR, Checkpoint, checkpoint_path
+from .db import FLUSH_SIZE
+from .embeddings import MAX_BATCH_TOKENS, MAX_INPUT_CHARS, generate_embeddings, token_batches
+from .engine import VECTOR_FORMAT, IngestionStats, RowSink, select_new_items
+from .sources import ContentSource
+
+
+async def ingest_source_async(source: ContentSource, client, conn, concurrency: int = 4,
+                              flush_size: int = FLUSH_SIZE, max_tokens: int = MAX_BATCH_TOKENS,
+                              cache: Optional[EmbeddingCache] = None,
+                              resume: bool = False,
+                              vector_format: str = VECTOR_FORMAT,
+                              checkpoint_dir: str = CHECKPOINT_DIR) -> IngestionStats:
+    """Async counterpart of engine.ingest_source()."""
+    stats = IngestionStats()
+    checkpoint = Checkpoint(checkpoint_path(source.content_path, checkpoint_dir), resume=resume)
+    cursor = conn.cursor()
+    # Batches are embedded out of order and written by index, so hold the selected items
+    selection = select_new_items(source, cursor, stats, checkpoint)
+    items = list(selection)
+    cursor.close()
+
+    texts = [source.embedding_text(item)[:MAX_INPUT_CHARS] for item in items]
+    semaphore = asyncio.Semaphore(concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def embed_batch(batch: List[int]):
+        async with semaphore:
+            vectors = await asyncio.to_thread(
+                generate_embeddings, client, [texts[i] for i in batch],
+                max_tokens=max_tokens, cache=cache
+            )
+            await queue.put((batch, vectors))
+
+    def write_batch(sink: RowSink, batch: List[int], vectors) -> None:
+        for i, vector in zip(batch, vectors):
+            sink.write(items[i], vector)
+
+    async def write_all():
+        sink = RowSink(source, conn, stats, len(items), flush_size=flush_size, checkpoint=checkpoint,
+                       vector_format=vector_format, selection=selection)
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    break
+                await asyncio.to_thread(write_batch, sink, *entry)
+        finally:
+            await asyncio.to_thread(sink.close)
+
+    writer = asyncio.create_task(write_all())
+
+    # Items without text are never batched; report them through the sink like the sequential path
+    empty = [i for i, text in enumerate(texts) if not text]
+    if empty:
+        await queue.put((empty, [None] * len(empty)))
+
+    producers = asyncio.gather(*(embed_batch(batch) for batch in token_batches(texts, max_tokens=max_tokens)))
+    try:
+        # A dead writer would leave producers blocked on a full queue
+        await asyncio.wait({producers, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            writer.result()
+        await producers
+        await queue.put(None)
+        await writer
+    except BaseException:
+        producers.cancel()
+        writer.cancel()
+        raise
+
+    return stats
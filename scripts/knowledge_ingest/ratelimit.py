@@ -0,0 +1,167 @@
+"""
+Rate limiting for embedding requests.
+
+RateLimitedClient wraps an OpenAI-compatible client so every
+`embeddings.create` call passes through requests-per-minute and
+tokens-per-minute token buckets and an adaptive in-flight limit. 429s honour
+Retry-After (pausing every caller, not just the one that was throttled) and
+halve the in-flight limit; transient failures are retried with jittered
+exponential backoff. A request that still fails raises, so the caller never
+mistakes it for an empty embedding.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from .embeddings import estimate_tokens
+
+EMBEDDING_RPM = int(os.environ.get('EMBEDDING_RPM', 3000))
+EMBEDDING_TPM = int(os.environ.get('EMBEDDING_TPM', 1000000))
+MAX_RETRIES = 6
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# 408/409 are retried by the OpenAI SDK too; everything else 4xx is permanent
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute` units."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """In-flight request limit: +1 after a clean window, halved on every 429."""
+
+    def __init__(self, limit: int, max_limit: Optional[int] = None):
+        self.limit = max(1, limit)
+        self.max_limit = max_limit or self.limit
+        self.in_flight = 0
+        self.successes = 0
+        self.cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self.cond:
+            while self.in_flight >= self.limit:
+                self.cond.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def on_success(self) -> None:
+        with self.cond:
+            self.successes += 1
+            if self.successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self.successes = 0
+                self.cond.notify_all()
+
+    def on_throttle(self) -> None:
+        with self.cond:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from Retry-After / retry-after-ms headers, if the server sent them."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class RateLimitedClient:
+    """Wraps a client so `client.embeddings.create` is rate limited and retried."""
+
+    def __init__(self, client, rpm: int = EMBEDDING_RPM, tpm: int = EMBEDDING_TPM,
+                 max_concurrency: int = 8, max_retries: int = MAX_RETRIES):
+        self.client = client
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.max_retries = max_retries
+        self.paused_until = 0.0
+        self.requests_sent = 0
+        self.retries = 0
+        self.throttled = 0
+        self.embeddings = self
+
+    def create(self, **kwargs):
+        inputs = kwargs.get('input') or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        tokens = sum(estimate_tokens(text) for text in inputs)
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_pause()
+            self.requests.acquire(1)
+            self.tokens.acquire(tokens)
+            self.concurrency.acquire()
+            try:
+                self.requests_sent += 1
+                response = self.client.embeddings.create(**kwargs)
+            except Exception as e:
+                status = _status_code(e)
+                if status is not None and status < 500 and status not in RETRYABLE_STATUS:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+
+                delay = min(MAX_DELAY, BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if status == 429:
+                    self.throttled += 1
+                    self.concurrency.on_throttle()
+                    delay = max(delay, _retry_after(e) or 0)
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                self.retries += 1
+                print(f"  Embedding request failed ({status or type(e).__name__}), "
+                      f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s "
+                      f"(in-flight limit {self.concurrency.limit})")
+            else:
+                self.concurrency.on_success()
+                return response
+            finally:
+                self.concurrency.release()
+            time.sleep(delay)
+
+    def _wait_for_pause(self) -> None:
+        wait = self.paused_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
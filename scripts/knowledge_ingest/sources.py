@@ -0,0 +1,133 @@
+"""
+Source adapters: one per content file fed into knowledge_embeddings.
+
+An adapter knows how to load its items and how to describe them (source
+type, dataset, document type, provenance). Everything else -- batching,
+dedup, connections and commits -- is owned by the engine.
+
+Content files are JSON Lines (.jsonl, one item per line), read lazily, or
+legacy JSON arrays (.json), loaded whole. Items longer than the chunk budget
+are split into several rows that share a sourceId (see chunking.py); each
+chunk carries the hash of the item's full content as `chunk_of`, so the
+engine can give all of an item's chunks one sourceId whatever order they are
+written in, and retire a row that stored the item unsplit.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .chunking import CHUNK_OVERLAP_TOKENS, CHUNK_TOKENS, chunk_text
+from .db import content_hash
+from .embeddings import EMBEDDING_MODEL
+
+
+class ContentSource:
+    """Base adapter for a content JSON file produced by the GS1 NL parsers."""
+
+    name = 'content'
+    content_path = ''
+    dataset_id = ''
+    default_version = ''
+    default_source_type = 'gs1_nl_datamodel'
+    document_type = 'datamodel_attribute'
+    authority_level = 'guidance'
+    legal_status = 'valid'
+    source_authority = 'GS1 Nederland'
+    semantic_layer = 'normative'
+    confidence_score = 0.95
+    chunk_tokens = CHUNK_TOKENS
+    chunk_overlap_tokens = CHUNK_OVERLAP_TOKENS
+
+    def __init__(self, content_path: Optional[str] = None):
+        if content_path:
+            self.content_path = content_path
+
+    def resolved_path(self) -> Optional[str]:
+        """The file to read: content_path, else its .json/.jsonl sibling, else None."""
+        root, ext = os.path.splitext(self.content_path)
+        sibling = root + ('.json' if ext == '.jsonl' else '.jsonl')
+        for path in (self.content_path, sibling):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Yield included items one at a time, without loading a .jsonl file whole."""
+        path = self.resolved_path() or self.content_path
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                items = (json.loads(line) for line in f if line.strip())
+            else:
+                items = json.load(f)
+            for item in items:
+                if self.include(item):
+                    yield item
+
+    def load_items(self) -> List[Dict[str, Any]]:
+        return list(self.iter_items())
+
+    def chunks(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The item itself, or one copy per chunk of its content with `chunk_index` and `chunk_of`."""
+        content = self.content(item)
+        pieces = chunk_text(content, self.chunk_tokens, self.chunk_overlap_tokens)
+        if len(pieces) == 1:
+            return [item]
+        item_hash = content_hash(content)
+        return [{**item, 'content': piece, 'chunk_index': i, 'chunk_of': item_hash}
+                for i, piece in enumerate(pieces)]
+
+    def iter_chunks(self) -> Iterator[Dict[str, Any]]:
+        """Yield the embeddable units of the source: items, with long ones split."""
+        for item in self.iter_items():
+            yield from self.chunks(item)
+
+    def include(self, item: Dict[str, Any]) -> bool:
+        return True
+
+    def source_type(self, item: Dict[str, Any]) -> str:
+        return item.get('source_type', self.default_source_type)
+
+    def content(self, item: Dict[str, Any]) -> str:
+        """Text stored in the `content` column (and hashed for dedup)."""
+        return item['content']
+
+    def embedding_text(self, item: Dict[str, Any]) -> str:
+        """Text sent to the embedding model."""
+        return self.content(item)
+
+    def dataset(self, item: Dict[str, Any]) -> str:
+        return self.dataset_id
+
+    def document_type_for(self, item: Dict[str, Any]) -> str:
+        return self.document_type
+
+    def build_row(self, item: Dict[str, Any], source_id: int,
+                  embedding: Optional[List[float]]) -> Dict[str, Any]:
+        """Map a content item to a knowledge_embeddings row."""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        content = self.content(item)
+        return {
+            'sourceType': self.source_type(item),
+            'sourceId': source_id,
+            'content': content,
+            'contentHash': content_hash(content),
+            'embedding': json.dumps(embedding) if embedding else '[]',
+            'embeddingModel': EMBEDDING_MODEL,
+            'title': item['title'][:500],
+            'url': (item.get('url') or '')[:500],
+            'datasetId': self.dataset(item),
+            'datasetVersion': item.get('version', self.default_version),
+            'chunk_index': item.get('chunk_index', 0),
+            'lastVerifiedDate': now,
+            'isDeprecated': 0,
+            'authority_level': self.authority_level,
+            'legal_status': self.legal_status,
+            'source_authority': self.source_authority,
+            'semantic_layer': self.semantic_layer,
+            'document_type': self.document_type_for(item),
+            'confidence_score': self.confidence_score,
+            'createdAt': now,
+            'updatedAt': now,
+        }
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Backfill the binary embedding_vector column of existing knowledge_embeddings
+rows from their JSON-text embeddings.
+
+Requires drizzle/migrations/0025_add_knowledge_embedding_vector_blob.sql.
+
+  python scripts/migrate_embedding_vectors.py --format f16 --dry-run
+  python scripts/migrate_embedding_vectors.py --format f32
+
+The JSON `embedding` column is left in place, so readers that only know the
+JSON form keep working.
+"""
+
+import argparse
+import json
+import sys
+
+from knowledge_ingest import VECTOR_FORMATS, decode_vector, encode_vector, get_db_connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill knowledge_embeddings.embedding_vector')
+    parser.add_argument('--format', choices=list(VECTOR_FORMATS), default='f32')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per UPDATE/commit')
+    parser.add_argument('--source-type', help='Only migrate rows of this sourceType')
+    parser.add_argument('--dry-run', action='store_true', help='Report sizes without writing')
+    args = parser.parse_args()
+
+    print("Connecting to database...")
+    conn = get_db_connection()
+    read_cursor = conn.cursor()
+    write_cursor = conn.cursor()
+
+    where = "embedding_vector IS NULL AND id > %s"
+    params = []
+    if args.source_type:
+        where += " AND sourceType = %s"
+        params.append(args.source_type)
+
+    update_sql = "UPDATE knowledge_embeddings SET embedding_vector = %s WHERE id = %s"
+
+    last_id = 0
+    migrated = 0
+    skipped = 0
+    json_bytes = 0
+    blob_bytes = 0
+
+    while True:
+        read_cursor.execute(
+            f"SELECT id, embedding FROM knowledge_embeddings WHERE {where} ORDER BY id LIMIT %s",
+            (last_id, *params, args.batch_size)
+        )
+        rows = read_cursor.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for row_id, embedding in rows:
+            text = embedding.decode('utf-8') if isinstance(embedding, bytes) else embedding
+            try:
+                vector = json.loads(text) if isinstance(text, str) else text
+            except ValueError:
+                vector = None
+            if not vector:
+                skipped += 1
+                continue
+            blob = encode_vector(vector, args.format)
+            # Round-trip check: a wrong dimension count would corrupt retrieval silently
+            decoded = len(decode_vector(blob))
+            if decoded != len(vector):
+                print(f"Row {row_id}: {len(vector)}-dim vector decoded to {decoded} dims, aborting")
+                sys.exit(1)
+            json_bytes += len(text) if isinstance(text, str) else len(json.dumps(vector))
+            blob_bytes += len(blob)
+            updates.append((blob, row_id))
+
+        if updates and not args.dry_run:
+            write_cursor.executemany(update_sql, updates)
+            conn.commit()
+        migrated += len(updates)
+        print(f"  Up to id {last_id}: {migrated} converted, {skipped} without a vector")
+
+    read_cursor.close()
+    write_cursor.close()
+    conn.close()
+
+    print(f"\n=== Summary{' (dry run)' if args.dry_run else ''} ===")
+    print(f"Converted: {migrated}")
+    print(f"Skipped (empty/invalid JSON): {skipped}")
+    if blob_bytes:
+        # The JSON is kept, so the blobs are added on top of it
+        print(f"Added {blob_bytes / 1e6:.1f} MB of {args.format} vectors to {json_bytes / 1e6:.1f} MB of JSON "
+              f"(+{blob_bytes / json_bytes:.0%} vector storage)")
+
+
+if __name__ == '__main__':
+    main()
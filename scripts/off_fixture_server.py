@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Local Open Food Facts search API for offline fetch runs.
+
+  # Record real responses once (misses are forwarded to OFF and saved)
+  python scripts/off_fixture_server.py --fixtures data/off_fixtures --record
+  python scripts/ingest-off-parallel.py --api-base http://127.0.0.1:8090 --store /tmp/off_record.sqlite
+
+  # Replay them with a slow, flaky, rate-limited server
+  python scripts/off_fixture_server.py --fixtures data/off_fixtures --no-synthetic \
+      --latency 0.3 --jitter 0.2 --error-rate 0.05 --max-concurrent 6
+
+Without --fixtures every request is answered from a deterministic synthetic
+catalogue. GET /_stats returns request, throttle and error counters.
+"""
+
+import argparse
+
+from aiohttp import web
+
+from off_ingest import OFF_API_BASE, create_app
+from off_ingest.server import add_server_arguments, config_from_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Open Food Facts search API',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--record', action='store_true',
+                        help=f'Forward requests missing from --fixtures to {OFF_API_BASE} and save them')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    if args.record and not args.fixtures:
+        parser.error('--record needs --fixtures')
+
+    config = config_from_args(args, upstream=OFF_API_BASE if args.record else None)
+    print(f"Serving OFF search on http://{args.host}:{args.port} "
+          f"({'recording' if args.record else 'replaying'} fixtures: {args.fixtures or 'none'}, "
+          f"synthetic fallback: {'on' if config.synthetic else 'off'})")
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
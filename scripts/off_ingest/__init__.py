@@ -0,0 +1,28 @@
+"""
+Open Food Facts product fetching for scripts/ingest-off-parallel.py.
+
+Fetched products go straight into a local SQLite product store, deduplicated
+by GTIN, so a run can be interrupted and resumed without losing pages.
+Which pages to fetch is decided by an adaptive per-term scheduler, and how
+many requests run at once by an AIMD limiter. server.py is a local stand-in
+for the OFF search API (fixture replay/recording, injected latency, errors
+and rate limits) for offline benchmarks.
+"""
+
+from .store import OFF_STORE_PATH, ProductStore, is_valid_product
+from .limiter import OFF_CONCURRENCY, OFF_MAX_CONCURRENCY, AIMDLimiter
+from .scheduler import (
+    OFF_MAX_PAGES,
+    OFF_MIN_NEW_PER_PAGE,
+    OFF_PAGE_SIZE,
+    OFF_TARGET_PRODUCTS,
+    PaginationScheduler,
+)
+from .fetch import (
+    OFF_API_BASE,
+    SEARCH_TERMS,
+    fetch_all_products,
+    fetch_page,
+    refresh_products,
+)
+from .server import ServerConfig, create_app, start_server
@@ -0,0 +1,206 @@
+"""
+Open Food Facts search fetching: single pages, adaptive full fetches and
+incremental refreshes, all written straight into a ProductStore.
+
+Requests go to OFF_API_BASE, so the same code can run against the local
+stand-in server (off_ingest/server.py) for offline benchmarks and tests.
+"""
+
+import asyncio
+import os
+import time
+
+import aiohttp
+
+from .limiter import OFF_CONCURRENCY, OFF_MAX_CONCURRENCY, AIMDLimiter
+from .scheduler import OFF_MAX_PAGES, OFF_MIN_NEW_PER_PAGE, OFF_PAGE_SIZE, OFF_TARGET_PRODUCTS, PaginationScheduler
+
+OFF_API_BASE = os.environ.get('OFF_API_BASE', 'https://world.openfoodfacts.org')
+SEARCH_PATH = '/cgi/search.pl'
+HEADERS = {'User-Agent': 'ISA-GS1-Research/1.0 (contact@gs1isa.com)'}
+
+OFF_REFRESH_PAGE_SIZE = int(os.environ.get('OFF_REFRESH_PAGE_SIZE', 20))
+# OFF's last_modified_t comes from the server clock; look back this far past each sync
+REFRESH_CLOCK_SKEW = 3600
+
+SEARCH_TERMS = [
+    'melk', 'kaas', 'yoghurt', 'boter', 'kwark', 'vla',
+    'brood', 'koek', 'beschuit', 'ontbijtkoek', 'crackers',
+    'vlees', 'kip', 'vis', 'rookworst', 'gehakt', 'ham', 'worst',
+    'sap', 'bier', 'koffie', 'thee', 'water', 'wijn', 'frisdrank', 'limonade',
+    'chips', 'hagelslag', 'stroopwafel', 'drop', 'chocolade', 'koekjes', 'noten', 'snoep',
+    'pasta', 'rijst', 'soep', 'saus', 'mayonaise', 'mosterd', 'pindakaas', 'jam', 'honing',
+    'groente', 'fruit', 'salade', 'tomaat', 'aardappel', 'ui', 'wortel',
+    'diepvries', 'pizza', 'ijs', 'friet',
+    'babyvoeding', 'zeep', 'shampoo', 'tandpasta', 'wasmiddel',
+    'albert heijn', 'jumbo', 'lidl', 'plus', 'aldi',
+    'muesli', 'cornflakes', 'havermout', 'granola',
+    'hummus', 'tofu', 'tempeh', 'falafel',
+    'olijfolie', 'zonnebloemolie', 'azijn',
+    'tonijn', 'zalm', 'garnalen', 'haring',
+    'appelmoes', 'pindas', 'rozijnen', 'cranberry',
+]
+
+FIELDS = 'code,product_name,brands,categories_tags,nutriscore_grade,ecoscore_grade,allergens,quantity,ingredients_text,packaging,image_front_url,nutriments,countries_tags,last_modified_t'
+
+
+async def fetch_page(session, term, page, limiter, page_size=OFF_PAGE_SIZE, sort_by=None):
+    """Fetch one page of results for a search term."""
+    params = {
+        'search_terms': term,
+        'search_simple': 1,
+        'action': 'process',
+        'json': 1,
+        'page_size': page_size,
+        'page': page,
+        'fields': FIELDS
+    }
+    if sort_by:
+        params['sort_by'] = sort_by
+
+    for attempt in range(limiter.max_retries + 1):
+        await limiter.acquire()
+        started = time.monotonic()
+        status = retry_after = None
+        try:
+            async with session.get(SEARCH_PATH, params=params, timeout=aiohttp.ClientTimeout(total=45)) as resp:
+                status = resp.status
+                if resp.status == 200:
+                    data = await resp.json(content_type=None)
+                    limiter.on_success(time.monotonic() - started)
+                    return [(term, page, data.get('products', []))]
+                if resp.status < 500 and resp.status != 429:
+                    return []
+                try:
+                    retry_after = float(resp.headers.get('Retry-After', ''))
+                except ValueError:
+                    pass
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            pass
+        finally:
+            await limiter.release()
+
+        delay = limiter.on_failure(attempt, status, retry_after)
+        if attempt < limiter.max_retries:
+            await asyncio.sleep(delay)
+    return []
+
+
+async def report_stats(limiter, interval):
+    """Print the limiter's live stats every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        print(f"  [fetch] {limiter.summary()}")
+
+
+async def fetch_all_products(store, terms=SEARCH_TERMS, target=OFF_TARGET_PRODUCTS,
+                             page_size=OFF_PAGE_SIZE, min_new=OFF_MIN_NEW_PER_PAGE, max_pages=OFF_MAX_PAGES,
+                             concurrency=OFF_CONCURRENCY, max_concurrency=OFF_MAX_CONCURRENCY,
+                             stats_interval=10.0, api_base=OFF_API_BASE, adaptive=True):
+    """Fetch products into the store until `target` is reached or every term stops yielding.
+
+    Without `adaptive` the in-flight limit stays at `concurrency`.
+    Returns the limiter, whose counters describe the run (None if nothing was fetched).
+    """
+    if len(store) >= target:
+        print(f"Using {len(store)} stored products from {store.path}")
+        return None
+
+    scheduler = PaginationScheduler(terms, page_size=page_size, min_new=min_new, max_pages=max_pages)
+    replayed = scheduler.seed(store.page_stats(page_size))
+    if replayed:
+        print(f"Resuming: {replayed} pages already in store, {len(scheduler.active_terms())} terms still active")
+
+    # Start polite and let the limiter find what OFF sustains
+    limiter = AIMDLimiter(concurrency, max_limit=max_concurrency, adaptive=adaptive)
+    reporter = asyncio.create_task(report_stats(limiter, stats_interval))
+    try:
+        async with aiohttp.ClientSession(api_base, headers=HEADERS) as session:
+            in_flight = {}
+            while True:
+                while len(in_flight) < limiter.limit and len(store) < target:
+                    request = scheduler.next_request()
+                    if request is None:
+                        break
+                    task = asyncio.create_task(fetch_page(session, *request, limiter, page_size=page_size))
+                    in_flight[task] = request
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    term, page = in_flight.pop(task)
+                    result = task.result()
+                    if not result:
+                        print(f"  '{term}' p{page}: request failed, dropping term")
+                        scheduler.record(term, page, None)
+                        continue
+                    products = result[0][2]
+                    added = store.add_page(term, page, products, page_size)
+                    scheduler.record(term, page, len(products), added)
+                    print(f"  '{term}' p{page}: {len(products)} fetched, {added} new ({len(store)} total)")
+    finally:
+        reporter.cancel()
+
+    print(f"\nFetch: {limiter.summary()}")
+    print(f"{scheduler.requests} pages, {len(store)} unique products "
+          f"({'target reached' if len(store) >= target else 'all terms exhausted'})")
+    return limiter
+
+
+async def refresh_term(session, store, term, since, limiter, page_size, max_pages):
+    """Pull a term's products modified after `since`, newest first; returns (pages, added, updated)."""
+    pages = added = updated = 0
+    started = time.time()
+    for page in range(1, max_pages + 1):
+        result = await fetch_page(session, term, page, limiter, page_size=page_size, sort_by='last_modified_t')
+        if not result:
+            print(f"  '{term}': request failed, keeping previous sync time")
+            return pages, added, updated
+        products = result[0][2]
+        pages += 1
+        changed = [p for p in products if (p.get('last_modified_t') or 0) > since]
+        page_added, page_updated = store.merge_products(term, changed)
+        added += page_added
+        updated += page_updated
+        # Results are sorted newest first: an unchanged product means the rest are older
+        if len(changed) < len(products) or len(products) < page_size:
+            break
+    else:
+        # Older changes may remain past the last page; advancing would lose them
+        print(f"  '{term}': still changed products after {max_pages} pages, keeping previous sync time")
+        return pages, added, updated
+    store.mark_term_synced(term, started)
+    if added or updated:
+        print(f"  '{term}': {added} new, {updated} updated ({pages} pages)")
+    return pages, added, updated
+
+
+async def refresh_products(store, terms=SEARCH_TERMS, page_size=OFF_REFRESH_PAGE_SIZE,
+                           max_pages=OFF_MAX_PAGES, concurrency=OFF_CONCURRENCY, max_concurrency=OFF_MAX_CONCURRENCY,
+                           stats_interval=10.0, api_base=OFF_API_BASE):
+    """Merge products modified since each term's last sync into the store; returns the limiter."""
+    watermarks = store.term_watermarks()
+    terms = [term for term in terms if term in watermarks]
+    if not terms:
+        print("Nothing to refresh: the store has no fetched terms yet")
+        return None
+    print(f"Refreshing {len(terms)} terms (changes since "
+          f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(min(watermarks[t] for t in terms)))})")
+
+    limiter = AIMDLimiter(concurrency, max_limit=max_concurrency)
+    reporter = asyncio.create_task(report_stats(limiter, stats_interval))
+    try:
+        async with aiohttp.ClientSession(api_base, headers=HEADERS) as session:
+            results = await asyncio.gather(*(
+                refresh_term(session, store, term, watermarks[term] - REFRESH_CLOCK_SKEW, limiter,
+                             page_size, max_pages)
+                for term in terms
+            ))
+    finally:
+        reporter.cancel()
+
+    pages, added, updated = (sum(column) for column in zip(*results))
+    print(f"\nFetch: {limiter.summary()}")
+    print(f"Refresh: {pages} pages, {added} new, {updated} updated, {len(store)} products stored")
+    return limiter
@@ -0,0 +1,120 @@
+"""
+AIMD concurrency control for Open Food Facts requests.
+
+The in-flight limit grows by one after every `limit` healthy responses
+(additive increase) and is halved on a 429, a 5xx, a timeout or a response
+slower than `latency_target` (multiplicative decrease). Decreases are applied
+at most once per typical response time, so a burst of failures from requests
+that were already in flight counts as one congestion signal. A 429 also
+pauses every caller for the server's Retry-After. Failed requests are retried
+with jittered exponential backoff instead of fixed sleeps. With `adaptive`
+off the limit stays where it started, as a plain semaphore with the same
+retry policy.
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Optional, Sequence
+
+OFF_CONCURRENCY = int(os.environ.get('OFF_CONCURRENCY', 3))
+OFF_MAX_CONCURRENCY = int(os.environ.get('OFF_MAX_CONCURRENCY', 16))
+OFF_LATENCY_TARGET = float(os.environ.get('OFF_LATENCY_TARGET', 10.0))
+MAX_RETRIES = 4
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# Responses kept for the latency percentiles
+LATENCY_WINDOW = 200
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class AIMDLimiter:
+    """Adaptive in-flight limit for asyncio request coroutines, with live stats."""
+
+    def __init__(self, limit: int = OFF_CONCURRENCY, max_limit: int = OFF_MAX_CONCURRENCY,
+                 latency_target: float = OFF_LATENCY_TARGET, max_retries: int = MAX_RETRIES,
+                 adaptive: bool = True):
+        self.limit = max(1, limit)
+        self.adaptive = adaptive
+        self.max_limit = max(max_limit, self.limit)
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.successes = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        wait = self.paused_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self.requests += 1
+
+    async def release(self) -> None:
+        async with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        if not self.adaptive:
+            return
+        if latency > self.latency_target:
+            self._decrease()
+            return
+        self.successes += 1
+        if self.successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self.successes = 0
+
+    def on_failure(self, attempt: int, status: Optional[int] = None,
+                   retry_after: Optional[float] = None) -> float:
+        """Record a 429/5xx/timeout and return the backoff before retry `attempt` + 1."""
+        self.errors += 1
+        if attempt < self.max_retries:
+            self.retries += 1
+        self._decrease()
+        delay = min(MAX_DELAY, BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+        if status == 429:
+            self.throttled += 1
+            delay = max(delay, retry_after or 0)
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        return delay
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if not self.adaptive or now - self.last_decrease < (self.p50 or 1.0):
+            return
+        self.last_decrease = now
+        self.limit = max(1, self.limit // 2)
+        self.successes = 0
+
+    @property
+    def p50(self) -> float:
+        return _percentile(self.latencies, 0.50)
+
+    @property
+    def p95(self) -> float:
+        return _percentile(self.latencies, 0.95)
+
+    def summary(self) -> str:
+        return (f"in-flight {self.in_flight}/{self.limit}, p50 {self.p50:.2f}s, p95 {self.p95:.2f}s, "
+                f"{self.requests} requests, {self.retries} retries ({self.throttled} rate limited)")
@@ -0,0 +1,93 @@
+"""
+Adaptive pagination over Open Food Facts search terms.
+
+Every term keeps an estimate of how many new GTINs its next page will add
+(an exponentially weighted average of the pages fetched so far). The most
+productive term is always fetched next, one page in flight per term so each
+result informs the next request, and a term is retired once its estimate
+falls below `min_new`, its results run out, or it reaches `max_pages`.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+OFF_PAGE_SIZE = int(os.environ.get('OFF_PAGE_SIZE', 100))
+OFF_MIN_NEW_PER_PAGE = float(os.environ.get('OFF_MIN_NEW_PER_PAGE', 5))
+OFF_MAX_PAGES = int(os.environ.get('OFF_MAX_PAGES', 20))
+OFF_TARGET_PRODUCTS = int(os.environ.get('OFF_TARGET_PRODUCTS', 250))
+
+# Weight of the latest page in a term's yield estimate
+YIELD_ALPHA = 0.5
+
+
+@dataclass
+class TermState:
+    term: str
+    order: int
+    next_page: int = 1
+    expected_new: float = 0.0
+    pages: int = 0
+    in_flight: bool = False
+    done: bool = False
+
+
+class PaginationScheduler:
+    """Chooses the next (term, page) to fetch from per-term yield estimates."""
+
+    def __init__(self, terms: Sequence[str], page_size: int = OFF_PAGE_SIZE,
+                 min_new: float = OFF_MIN_NEW_PER_PAGE, max_pages: int = OFF_MAX_PAGES):
+        self.page_size = page_size
+        self.min_new = min_new
+        self.max_pages = max_pages
+        # Unfetched terms are assumed to fill a whole page, so each gets tried once
+        self.terms: Dict[str, TermState] = {
+            term: TermState(term, i, expected_new=float(page_size)) for i, term in enumerate(dict.fromkeys(terms))
+        }
+        self.requests = 0
+
+    def seed(self, pages: Iterable[Tuple[str, int, int, int]]) -> int:
+        """Replay (term, page, fetched, added) records of a previous run; returns pages replayed."""
+        replayed = 0
+        for term, page, fetched, added in pages:
+            state = self.terms.get(term)
+            if state is not None and not state.done and page == state.next_page:
+                self._update(state, fetched, added)
+                replayed += 1
+        return replayed
+
+    def next_request(self) -> Optional[Tuple[str, int]]:
+        """The (term, page) with the highest expected yield, or None if nothing is ready."""
+        ready = [s for s in self.terms.values() if not s.done and not s.in_flight]
+        if not ready:
+            return None
+        state = max(ready, key=lambda s: (s.expected_new, -s.order))
+        state.in_flight = True
+        self.requests += 1
+        return state.term, state.next_page
+
+    def record(self, term: str, page: int, fetched: Optional[int], added: int = 0) -> None:
+        """Feed back a fetched page; `fetched` None marks a failed request, retiring the term."""
+        state = self.terms[term]
+        state.in_flight = False
+        if fetched is None:
+            state.done = True
+            return
+        self._update(state, fetched, added)
+
+    def _update(self, state: TermState, fetched: int, added: int) -> None:
+        if state.pages:
+            state.expected_new = YIELD_ALPHA * added + (1 - YIELD_ALPHA) * state.expected_new
+        else:
+            state.expected_new = float(added)
+        state.pages += 1
+        state.next_page += 1
+        if fetched < self.page_size or state.expected_new < self.min_new or state.next_page > self.max_pages:
+            state.done = True
+
+    @property
+    def finished(self) -> bool:
+        return all(s.done for s in self.terms.values())
+
+    def active_terms(self) -> List[str]:
+        return [s.term for s in self.terms.values() if not s.done]
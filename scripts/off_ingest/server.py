@@ -0,0 +1,263 @@
+"""
+Local stand-in for the Open Food Facts search API.
+
+Serves /cgi/search.pl from recorded fixtures, so fetch strategies can be
+benchmarked and regression-tested without touching world.openfoodfacts.org.
+With `upstream` set, requests missing from the fixtures are forwarded to the
+real API once and recorded. Requests with no fixture are answered from a
+deterministic synthetic catalogue unless that is switched off. Latency,
+injected errors and rate limiting are configurable, so the fetcher can be
+run against the conditions it has to cope with in production.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+import aiohttp
+from aiohttp import web
+
+from .fetch import HEADERS, SEARCH_PATH
+
+# Query parameters that select a response; `fields`, `json` etc. do not
+FIXTURE_PARAMS = ('search_terms', 'page', 'page_size', 'sort_by')
+
+# Synthetic catalogue: GTINs are drawn from a shared pool so terms overlap
+SYNTHETIC_POOL = 50000
+SYNTHETIC_TERM_SIZES = (20, 80, 300, 1200)
+SYNTHETIC_BRANDS = ('Albert Heijn', 'Jumbo', 'Lidl', 'Plus', 'Aldi', 'Unilever', 'Campina', 'Verkade')
+
+
+def fixture_key(query: Mapping[str, str]) -> str:
+    return '&'.join(f'{name}={query[name]}' for name in FIXTURE_PARAMS if query.get(name))
+
+
+class FixtureStore:
+    """Recorded responses, one JSON file per request key."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, status: int, body: Any) -> None:
+        path = self._path(key)
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'status': status, 'body': body}, f, ensure_ascii=False)
+        os.replace(f'{path}.tmp', path)
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+
+
+@dataclass
+class ServerConfig:
+    fixtures_dir: Optional[str] = None
+    upstream: Optional[str] = None
+    synthetic: bool = True
+    latency: float = 0.0
+    jitter: float = 0.0
+    latency_per_request: float = 0.0
+    error_rate: float = 0.0
+    max_concurrent: int = 0
+    rate: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    fixtures: int = 0
+    synthetic: int = 0
+    recorded: int = 0
+    missing: int = 0
+    throttled: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    bytes: int = 0
+
+
+class SyntheticCatalogue:
+    """Deterministic fake search results: each term matches a fixed product list."""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.terms: Dict[str, List[Dict[str, Any]]] = {}
+
+    def products(self, term: str) -> List[Dict[str, Any]]:
+        if term not in self.terms:
+            rng = random.Random(zlib.crc32(f'{self.seed}:{term}'.encode('utf-8')))
+            codes = rng.sample(range(SYNTHETIC_POOL), rng.choice(SYNTHETIC_TERM_SIZES))
+            now = int(time.time())
+            self.terms[term] = [{
+                'code': f'87{code:011d}',
+                'product_name': f'{term} {i + 1}',
+                'brands': rng.choice(SYNTHETIC_BRANDS),
+                'countries_tags': ['en:netherlands'],
+                'last_modified_t': now - rng.randrange(365 * 86400),
+            } for i, code in enumerate(codes)]
+        return self.terms[term]
+
+    def search(self, query: Mapping[str, str]) -> Dict[str, Any]:
+        products = self.products(query.get('search_terms', ''))
+        if query.get('sort_by') == 'last_modified_t':
+            products = sorted(products, key=lambda p: -p['last_modified_t'])
+        page_size = int(query.get('page_size') or 24)
+        page = int(query.get('page') or 1)
+        return {
+            'count': len(products),
+            'page': page,
+            'page_size': page_size,
+            'products': products[(page - 1) * page_size:page * page_size],
+        }
+
+
+class _RequestBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def create_app(config: ServerConfig) -> web.Application:
+    """aiohttp application serving the search endpoint and GET /_stats (?reset=1 clears it)."""
+    app = web.Application()
+    stats = ServerStats()
+    fixtures = FixtureStore(config.fixtures_dir) if config.fixtures_dir else None
+    catalogue = SyntheticCatalogue(config.seed)
+    bucket = _RequestBucket(config.rate) if config.rate > 0 else None
+    rng = random.Random(config.seed)
+    app['stats'] = stats
+
+    def json_response(status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        text = json.dumps(body, ensure_ascii=False)
+        stats.bytes += len(text)
+        return web.Response(status=status, text=text, content_type='application/json', headers=headers)
+
+    async def record(key: str, query: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+        async with app['upstream'].get(SEARCH_PATH, params=dict(query)) as resp:
+            if resp.status != 200:
+                return None
+            body = await resp.json(content_type=None)
+        fixtures.put(key, 200, body)
+        stats.recorded += 1
+        return {'status': 200, 'body': body}
+
+    async def search(request: web.Request) -> web.Response:
+        stats.requests += 1
+        if (config.max_concurrent and stats.in_flight >= config.max_concurrent) or (bucket and not bucket.take()):
+            stats.throttled += 1
+            return json_response(429, {'error': 'rate limited'}, {'Retry-After': str(config.retry_after)})
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            delay = config.latency + config.latency_per_request * (stats.in_flight - 1)
+            await asyncio.sleep(delay + rng.uniform(0, config.jitter))
+            if rng.random() < config.error_rate:
+                stats.errors += 1
+                return json_response(503, {'error': 'injected failure'})
+
+            key = fixture_key(request.query)
+            entry = fixtures.get(key) if fixtures is not None else None
+            if entry is not None:
+                stats.fixtures += 1
+            elif config.upstream and fixtures is not None:
+                entry = await record(key, request.query)
+            if entry is None and config.synthetic:
+                stats.synthetic += 1
+                entry = {'status': 200, 'body': catalogue.search(request.query)}
+            if entry is None:
+                stats.missing += 1
+                return json_response(404, {'error': f'no fixture for {key}'})
+            return json_response(entry['status'], entry['body'])
+        finally:
+            stats.in_flight -= 1
+
+    async def stats_handler(request: web.Request) -> web.Response:
+        body = asdict(stats)
+        if request.query.get('reset'):
+            for name, value in asdict(ServerStats()).items():
+                if name != 'in_flight':
+                    setattr(stats, name, value)
+        return web.json_response(body)
+
+    async def open_upstream(app: web.Application):
+        app['upstream'] = aiohttp.ClientSession(config.upstream, headers=HEADERS) if config.upstream else None
+        yield
+        if app['upstream'] is not None:
+            await app['upstream'].close()
+
+    app.router.add_get(SEARCH_PATH, search)
+    app.router.add_get('/_stats', stats_handler)
+    app.cleanup_ctx.append(open_upstream)
+    return app
+
+
+async def start_server(config: ServerConfig, host: str = '127.0.0.1', port: int = 0):
+    """Run the app in the current event loop; returns (runner, base URL). Port 0 picks a free port."""
+    runner = web.AppRunner(create_app(config))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner, f'http://{host}:{runner.addresses[0][1]}'
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the stand-in server and the fetch benchmark."""
+    parser.add_argument('--fixtures', help='Directory of recorded responses to replay')
+    parser.add_argument('--no-synthetic', action='store_true',
+                        help='Answer requests without a fixture with 404 instead of synthetic products')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds, up to this much')
+    parser.add_argument('--latency-per-request', type=float, default=0.0,
+                        help='Extra seconds per other request in flight (simulates server load)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--max-concurrent', type=int, default=0,
+                        help='Answer 429 above this many requests in flight (0: no limit)')
+    parser.add_argument('--rate', type=float, default=0.0, help='Answer 429 above this many requests/s (0: no limit)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency, errors and the synthetic catalogue')
+
+
+def config_from_args(args: argparse.Namespace, upstream: Optional[str] = None) -> ServerConfig:
+    return ServerConfig(
+        fixtures_dir=args.fixtures,
+        upstream=upstream,
+        synthetic=not args.no_synthetic,
+        latency=args.latency,
+        jitter=args.jitter,
+        latency_per_request=args.latency_per_request,
+        error_rate=args.error_rate,
+        max_concurrent=args.max_concurrent,
+        rate=args.rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
@@ -0,0 +1,174 @@
+"""
+Crash-safe, deduplicating store for Open Food Facts products.
+
+Products live in a SQLite file keyed by GTIN (the OFF `code`). Each fetched
+page is written in its own transaction as soon as it arrives, together with
+a record of the (search term, page size, page) it came from and how many new
+GTINs it added. An interrupted run keeps everything it fetched, and a rerun
+resumes pagination from those records. Every product also keeps its OFF
+`last_modified_t` and the time it was last synced, so a refresh only has to
+pull and merge what changed since. Reads stream rows from disk; nothing
+requires the whole catalogue in memory.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+OFF_STORE_PATH = os.path.expanduser(os.environ.get('OFF_STORE_PATH', '~/.cache/isa/off_products.sqlite'))
+
+
+def is_valid_product(product: Dict[str, Any]) -> bool:
+    """A usable product: a GTIN of at least 8 digits and a name."""
+    code = product.get('code') or ''
+    return len(code) >= 8 and bool(product.get('product_name'))
+
+
+class ProductStore:
+    """SQLite-backed OFF product store with a GTIN primary key."""
+
+    def __init__(self, path: str = OFF_STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                gtin TEXT PRIMARY KEY,
+                product TEXT NOT NULL,
+                term TEXT,
+                last_modified_t INTEGER,
+                fetched_at REAL NOT NULL,
+                synced_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                term TEXT NOT NULL,
+                page_size INTEGER NOT NULL,
+                page INTEGER NOT NULL,
+                fetched INTEGER NOT NULL,
+                added INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (term, page_size, page)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS term_syncs (
+                term TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def add_page(self, term: str, page: int, products: Iterable[Dict[str, Any]], page_size: int) -> int:
+        """Store one fetched page in a single transaction; returns how many GTINs were new."""
+        now = time.time()
+        products = list(products)
+        rows = [
+            (p['code'], json.dumps(p, ensure_ascii=False), term, p.get('last_modified_t'), now, now)
+            for p in products if is_valid_product(p)
+        ]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO products (gtin, product, term, last_modified_t, fetched_at, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (term, page_size, page, fetched, added, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (term, page_size, page, len(products), added, now)
+            )
+        return added
+
+    def page_stats(self, page_size: int) -> List[Tuple[str, int, int, int]]:
+        """(term, page, fetched, added) of every stored page of `page_size`, in page order."""
+        return self.conn.execute(
+            "SELECT term, page, fetched, added FROM pages WHERE page_size = ? ORDER BY page, rowid", (page_size,)
+        ).fetchall()
+
+    def merge_products(self, term: str, products: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert refreshed products; returns (added, updated).
+
+        A stored product is replaced only when the fetched copy has a newer
+        `last_modified_t`; every GTIN seen gets its `synced_at` bumped.
+        """
+        now = time.time()
+        fetched = {p['code']: p for p in products if is_valid_product(p)}
+        if not fetched:
+            return 0, 0
+        stored = dict(self.conn.execute(
+            f"SELECT gtin, COALESCE(last_modified_t, 0) FROM products "
+            f"WHERE gtin IN ({', '.join(['?'] * len(fetched))})", tuple(fetched)
+        ))
+
+        added = updated = 0
+        with self.conn:
+            for gtin, product in fetched.items():
+                modified = product.get('last_modified_t') or 0
+                if gtin not in stored:
+                    self.conn.execute(
+                        "INSERT INTO products (gtin, product, term, last_modified_t, fetched_at, synced_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (gtin, json.dumps(product, ensure_ascii=False), term, modified or None, now, now)
+                    )
+                    added += 1
+                elif modified > stored[gtin]:
+                    self.conn.execute(
+                        "UPDATE products SET product = ?, last_modified_t = ?, synced_at = ? WHERE gtin = ?",
+                        (json.dumps(product, ensure_ascii=False), modified, now, gtin)
+                    )
+                    updated += 1
+                else:
+                    self.conn.execute("UPDATE products SET synced_at = ? WHERE gtin = ?", (now, gtin))
+        return added, updated
+
+    def term_watermarks(self) -> Dict[str, float]:
+        """Per search term, the time since which changes have not been pulled.
+
+        That is the term's last refresh, or, for terms never refreshed, when
+        its first page was fetched.
+        """
+        watermarks = dict(self.conn.execute("SELECT term, MIN(fetched_at) FROM pages GROUP BY term"))
+        watermarks.update(self.conn.execute("SELECT term, synced_at FROM term_syncs"))
+        return watermarks
+
+    def mark_term_synced(self, term: str, synced_at: float) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO term_syncs (term, synced_at) VALUES (?, ?)", (term, synced_at))
+
+    def __contains__(self, gtin: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM products WHERE gtin = ?", (gtin,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored products in fetch order, streaming from disk."""
+        for (product,) in self.conn.execute("SELECT product FROM products ORDER BY rowid"):
+            yield json.loads(product)
+
+    def export_ndjson(self, path: str) -> int:
+        """Write every product as one JSON line, replacing `path` atomically."""
+        tmp_path = f'{path}.tmp'
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for product in self.iter_products():
+                f.write(json.dumps(product, ensure_ascii=False) + '\n')
+                count += 1
+        os.replace(tmp_path, path)
+        return count
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
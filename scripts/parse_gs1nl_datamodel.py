@@ -1,167 +1,510 @@
 #!/usr/bin/env python3
 """
-Parse GS1 Nederland Benelux FMCG Datamodel and generate content for ISA knowledge base.
+Parse GS1 Nederland Benelux datamodels (FMCG, DIY, Healthcare) and generate content for ISA knowledge base.
+
+  python scripts/parse_gs1nl_datamodel.py
+  python scripts/parse_gs1nl_datamodel.py --registry --workers 4
+  python scripts/parse_gs1nl_datamodel.py path/to/workbook.xlsx --merge /tmp/datamodel_content.jsonl
+
+Content is written as JSON Lines (one item per line) to data/gs1nl/<sector>_datamodel_content.jsonl.
 """
 
 import pandas as pd
+import argparse
+import glob
+import hashlib
 import json
 import os
-from typing import List, Dict, Any
-
-def parse_fmcg_datamodel(filepath: str) -> List[Dict[str, Any]]:
-    """Parse the Benelux FMCG datamodel Excel file and extract attributes."""
-    
-    # Read the Attributen sheet with header at row 1
-    df = pd.read_excel(filepath, sheet_name='Attributen', header=1)
-    
-    # Get all column names
-    columns = df.columns.tolist()
-    
-    attributes = []
-    
-    for idx, row in df.iterrows():
-        try:
-            # Column mapping based on actual Excel structure:
-            # Col 0: Lokale attribuutnaam (Dutch name)
-            # Col 1: GDSN naam (GDSN name)
-            # Col 2: BMS ID
-            # Col 3: TC Field ID
-            # Col 5: Definitie (Definition)
-            # Col 6: Voorbeeld (Example)
-            # Col 7: Instructies (Instructions)
-            # Col 8: Opmerkingen (Remarks)
-            
-            attr = {
-                'attribute_name_nl': str(row.iloc[0]) if pd.notna(row.iloc[0]) else None,
-                'gdsn_name': str(row.iloc[1]) if pd.notna(row.iloc[1]) else None,
-                'bms_id': str(row.iloc[2]) if pd.notna(row.iloc[2]) else None,
-                'tc_field_id': str(row.iloc[3]) if pd.notna(row.iloc[3]) else None,
-                'definition_nl': str(row.iloc[5]) if pd.notna(row.iloc[5]) else None,
-                'example': str(row.iloc[6]) if pd.notna(row.iloc[6]) else None,
-                'instruction_nl': str(row.iloc[7]) if pd.notna(row.iloc[7]) else None,
-                'remarks': str(row.iloc[8]) if pd.notna(row.iloc[8]) else None,
-            }
-            
-            # Try to get additional columns if they exist
-            if len(row) > 19:
-                attr['data_type'] = str(row.iloc[19]) if pd.notna(row.iloc[19]) else None
-            if len(row) > 20:
-                attr['max_length'] = str(row.iloc[20]) if pd.notna(row.iloc[20]) else None
-            if len(row) > 21:
-                attr['code_list'] = str(row.iloc[21]) if pd.notna(row.iloc[21]) else None
-            if len(row) > 23:
-                attr['model_layer'] = str(row.iloc[23]) if pd.notna(row.iloc[23]) else None
-            if len(row) > 39:
-                attr['gdsn_xpath'] = str(row.iloc[39]) if pd.notna(row.iloc[39]) else None
-            
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.utils.exceptions import InvalidFileException
+
+try:
+    import pyarrow  # enables the Parquet parse cache
+except ImportError:
+    pyarrow = None
+
+@dataclass(frozen=True)
+class DatamodelProfile:
+    """Where a datamodel workbook keeps its attributes and how its columns are labelled.
+
+    headers maps each logical field to header texts it may appear under; a
+    column matches when its normalised header starts with one of them.
+    positions gives fallback column offsets for fields whose header text is
+    not recognised.
+    """
+    name: str
+    sheet_name: str
+    header_row: int  # 1-based
+    name_field: str  # rows without a value here are not attributes
+    headers: Dict[str, Tuple[str, ...]]
+    positions: Dict[str, int] = field(default_factory=dict)
+    code_list_sheet: Optional[str] = None
+
+
+# GS1 Data Source (Benelux) datamodel, Dutch 'Attributen' sheet, header on the second row
+FMCG_PROFILE = DatamodelProfile(
+    name='fmcg',
+    sheet_name='Attributen',
+    header_row=2,
+    name_field='attribute_name_nl',
+    headers={
+        'attribute_name_nl': ('lokale attribuutnaam',),
+        'gdsn_name': ('gdsn naam', 'gdsn name'),
+        'bms_id': ('bms id',),
+        'tc_field_id': ('tc field id',),
+        'definition_nl': ('definitie',),
+        'example': ('voorbeeld',),
+        'instruction_nl': ('instructie',),
+        'remarks': ('opmerking',),
+        'data_type': ('datatype', 'data type', 'formaat'),
+        'max_length': ('maximale lengte', 'lengte'),
+        'code_list': ('codelijst',),
+        'model_layer': ('model laag', 'modellaag', 'laag'),
+        'gdsn_xpath': ('xpath', 'xml path'),
+    },
+    # Offsets of the 3.1.34 FMCG workbook
+    positions={
+        'attribute_name_nl': 0,
+        'gdsn_name': 1,
+        'bms_id': 2,
+        'tc_field_id': 3,
+        'definition_nl': 5,
+        'example': 6,
+        'instruction_nl': 7,
+        'remarks': 8,
+        'data_type': 19,
+        'max_length': 20,
+        'code_list': 21,
+        'model_layer': 23,
+        'gdsn_xpath': 39,
+    },
+    code_list_sheet='Codelijsten',
+)
+
+# DIY/Garden & Pet ships the same GS1 Data Source layout as FMCG
+DIY_PROFILE = replace(FMCG_PROFILE, name='diy')
+
+# ECHO common datamodel (healthcare), English 'Attributes' sheet. Columns shift
+# between releases (3.1.31 has an extra EUDAMED column), so no offsets here.
+HEALTHCARE_PROFILE = DatamodelProfile(
+    name='healthcare',
+    sheet_name='Attributes',
+    header_row=4,
+    name_field='attribute_name_en',
+    headers={
+        'bms_id': ('bms id',),
+        'attribute_name_en': ('attribute name english',),
+        'business_name': ('attribute definitions for business names',),
+        'business_definition': ('attribute definitions for business definitions',),
+        'definition_en': ('definition english',),
+        'instruction_en': ('instruction/entry notes',),
+        'example': ('examples',),
+        'technical_notation': ('technical notation',),
+        'business_notation': ('business notation',),
+        'local_exception': ('local exception',),
+        'eudamed': ('eudamed',),
+        'data_type': ('format',),
+        'max_length': ('length',),
+        'code_list': ('code list name',),
+        'repeatable': ('repeatable',),
+        'dependency': ('dependency',),
+        'gdsn_name': ('gdsn name',),
+        'gdsn_xpath': ('xml path',),
+    },
+)
+
+DATAMODEL_PROFILES = {p.name: p for p in (FMCG_PROFILE, DIY_PROFILE, HEALTHCARE_PROFILE)}
+
+
+def _normalise_header(value: Any) -> str:
+    """Lowercase header text with runs of whitespace collapsed."""
+    if value is None:
+        return ''
+    return ' '.join(str(value).split()).lower()
+
+
+def resolve_columns(header: Sequence[Any], profile: DatamodelProfile) -> Dict[str, int]:
+    """Map the profile's logical fields to column positions in a header row.
+
+    Raises ValueError when the attribute name column cannot be found, which
+    means the sheet does not follow the profile.
+    """
+    labels = [_normalise_header(h) for h in header]
+    matched = {}
+    for name, aliases in profile.headers.items():
+        idx = next((i for i, label in enumerate(labels) if label.startswith(aliases)), None)
+        if idx is not None:
+            matched[name] = idx
+
+    # The name column must be recognised by its header; offsets alone would
+    # happily "parse" any sheet that happens to share the sheet name
+    if profile.name_field not in matched:
+        raise ValueError(f"{profile.sheet_name} row {profile.header_row} has no "
+                         f"{profile.name_field} column for profile '{profile.name}'")
+
+    columns = {}
+    for name in profile.headers:
+        idx = matched.get(name, profile.positions.get(name))
+        if idx is not None and idx < len(labels):
+            columns[name] = idx
+    return columns
+
+
+def detect_profile(sheetnames: Sequence[str]) -> DatamodelProfile:
+    """Pick the profile whose attribute sheet the workbook has."""
+    for profile in DATAMODEL_PROFILES.values():
+        if profile.sheet_name in sheetnames:
+            return profile
+    raise ValueError(f"No datamodel profile matches sheets {list(sheetnames)}")
+
+
+# Cell values treated as empty: blanks and Excel error results such as #N/A
+EMPTY_CELL_VALUES = ('',) + ERROR_CODES
+_EMPTY_CELLS = frozenset(EMPTY_CELL_VALUES)
+
+
+def _cell_str(value: Any) -> Optional[str]:
+    """String value of a cell, None for empty and error cells."""
+    if value is None or value in _EMPTY_CELLS:
+        return None
+    return str(value)
+
+
+def iter_datamodel_attributes(filepath: str,
+                              profile: Optional[DatamodelProfile] = None) -> Iterator[Dict[str, Any]]:
+    """Stream attribute dicts from a datamodel workbook.
+
+    Uses openpyxl's read-only row iterator, so memory stays bounded regardless
+    of sheet size. Columns are resolved once from the header row; fields the
+    workbook does not have are left out of every attribute. Without a profile
+    one is picked from the workbook's sheet names.
+    """
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        profile = profile or detect_profile(wb.sheetnames)
+        ws = wb[profile.sheet_name]
+        header = next(ws.iter_rows(min_row=profile.header_row, max_row=profile.header_row,
+                                   values_only=True), ())
+        columns = list(resolve_columns(header, profile).items())
+        name_field = profile.name_field
+
+        # max_col pads short rows, so every index below is in range
+        for row in ws.iter_rows(min_row=profile.header_row + 1, max_col=len(header), values_only=True):
+            attr = {name: _cell_str(row[idx]) for name, idx in columns}
+
             # Only add if we have at least an attribute name
-            if attr['attribute_name_nl'] and attr['attribute_name_nl'] != 'nan':
-                attributes.append(attr)
-        except Exception as e:
-            print(f"Error parsing row {idx}: {e}")
-            continue
-    
-    return attributes
-
-
-def parse_code_lists(filepath: str) -> List[Dict[str, Any]]:
-    """Parse the Codelijsten (code lists) sheet."""
-    
-    df = pd.read_excel(filepath, sheet_name='Codelijsten', header=None)
-    
-    code_lists = {}
-    current_list_name = None
-    
-    for idx in range(len(df)):
-        row = df.iloc[idx]
-        try:
-            col0 = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ''
-            col1 = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(row.iloc[1]) else ''
-            col2 = str(row.iloc[2]).strip() if len(row) > 2 and pd.notna(row.iloc[2]) else ''
-            
+            if attr[name_field] and attr[name_field] != 'nan':
+                yield attr
+    finally:
+        wb.close()
+
+
+def extract_datamodel_attributes(df: pd.DataFrame, profile: DatamodelProfile) -> pd.DataFrame:
+    """Select and stringify the attribute columns of a loaded attribute sheet.
+
+    Works on whole columns: cells become str, empty cells None, and rows
+    without an attribute name are dropped by mask.
+    """
+    columns = resolve_columns(list(df.columns), profile)
+    frame = df.iloc[:, list(columns.values())]
+    frame.columns = list(columns)
+    # object dtype so masked cells hold None rather than NaN
+    frame = frame.astype(str).astype(object).where(frame.notna(), None)
+
+    name = frame[profile.name_field]
+    return frame[name.notna() & (name != 'nan')].reset_index(drop=True)
+
+
+def read_attribute_sheet(filepath: str, profile: DatamodelProfile) -> pd.DataFrame:
+    """Load a profile's attribute sheet as-is."""
+    # dtype=object keeps integer cells such as BMS IDs from becoming floats; only
+    # blanks and Excel errors count as missing, not text like 'NA'
+    return pd.read_excel(filepath, sheet_name=profile.sheet_name, header=profile.header_row - 1,
+                         dtype=object, keep_default_na=False, na_values=list(EMPTY_CELL_VALUES))
+
+
+def read_attribute_frame(filepath: str, profile: Optional[DatamodelProfile] = None) -> pd.DataFrame:
+    """Load the attribute columns of a datamodel workbook into a DataFrame."""
+    if profile is None:
+        profile = detect_profile(pd.ExcelFile(filepath).sheet_names)
+    return extract_datamodel_attributes(read_attribute_sheet(filepath, profile), profile)
+
+
+def parse_fmcg_datamodel(filepath: str, engine: str = 'stream',
+                         profile: Optional[DatamodelProfile] = None) -> List[Dict[str, Any]]:
+    """Parse a Benelux datamodel Excel file and extract attributes.
+
+    engine='stream' walks the sheet row by row with bounded memory;
+    engine='pandas' loads it into a DataFrame and extracts whole columns.
+    """
+    if engine == 'pandas':
+        return read_attribute_frame(filepath, profile).to_dict('records')
+    return list(iter_datamodel_attributes(filepath, profile))
+
+
+def _cell_text(value: Any) -> str:
+    """Stripped text of a cell, '' for empty and error cells."""
+    if value is None or value in _EMPTY_CELLS:
+        return ''
+    return str(value).strip()
+
+
+def iter_code_lists(filepath: str, sheet_name: str = 'Codelijsten') -> Iterator[Dict[str, Any]]:
+    """Stream code lists from the Codelijsten sheet in a single pass.
+
+    A row with a first cell but no second cell starts a new list; rows with a
+    code and a (non-URL) description add codes to the current one. Each list
+    is yielded as soon as the next one starts, so a name the sheet repeats is
+    yielded more than once.
+    """
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        name = None
+        codes: List[Dict[str, Any]] = []
+
+        # max_col pads short rows, so every row unpacks to three cells
+        for row in wb[sheet_name].iter_rows(max_col=3, values_only=True):
+            col0, col1, col2 = map(_cell_text, row)
+
             # Skip empty rows
-            if not col0 or col0 == 'nan':
+            if not col0:
                 continue
-            
-            # Check if this looks like a code list header (usually longer text or specific format)
+
             if col1 and not col1.startswith('http') and len(col0) < 100:
-                # This is likely a code entry
-                if current_list_name:
-                    if current_list_name not in code_lists:
-                        code_lists[current_list_name] = []
-                    code_lists[current_list_name].append({
+                # Code entry
+                if name is not None:
+                    codes.append({
                         'code': col0,
                         'description_nl': col1,
-                        'description_en': col2 if col2 and col2 != 'nan' else None
+                        'description_en': col2 or None
                     })
-            elif not col1 or col1 == 'nan':
-                # This might be a header
-                current_list_name = col0
-                
-        except Exception as e:
-            continue
-    
-    # Convert to list format
-    result = []
-    for name, codes in code_lists.items():
-        if codes and len(codes) >= 2:
-            result.append({
-                'name': name,
-                'codes': codes
-            })
-    
-    return result
+            elif not col1:
+                # Header of the next list
+                if codes:
+                    yield {'name': name, 'codes': codes}
+                name, codes = col0, []
 
+        if codes:
+            yield {'name': name, 'codes': codes}
+    finally:
+        wb.close()
 
-def generate_knowledge_content(attributes: List[Dict], code_lists: List[Dict], sector: str, version: str) -> List[Dict[str, Any]]:
-    """Generate knowledge base content from parsed datamodel."""
-    
-    content_items = []
-    
-    # Clean up None/nan values
-    def clean(val):
-        if val is None or val == 'nan' or val == 'None' or val == 'NaN':
-            return 'N/A'
-        return str(val).strip()
-    
-    # Generate content for each attribute
-    for attr in attributes:
-        if not attr.get('attribute_name_nl'):
-            continue
-            
-        content = f"""GS1 Benelux {sector} Datamodel - Attribuut: {clean(attr['attribute_name_nl'])}
+
+def parse_code_lists(filepath: str, sheet_name: str = 'Codelijsten') -> List[Dict[str, Any]]:
+    """Parse the Codelijsten (code lists) sheet.
+
+    Lists sharing a name are merged; lists with fewer than two codes are dropped.
+    """
+    merged: Dict[str, List[Dict[str, Any]]] = {}
+    for code_list in iter_code_lists(filepath, sheet_name):
+        merged.setdefault(code_list['name'], []).extend(code_list['codes'])
+    return [{'name': name, 'codes': codes} for name, codes in merged.items() if len(codes) >= 2]
+
+
+# Bump whenever parser output changes, so parses cached by older code are ignored
+PARSER_VERSION = 4
+
+DATAMODEL_CACHE_DIR = os.path.expanduser(
+    os.environ.get('DATAMODEL_CACHE_DIR', '~/.cache/isa/datamodel')
+)
+DATAMODEL_CACHE_ENABLED = os.environ.get('DATAMODEL_CACHE', '').lower() not in ('0', 'off', 'false', 'no')
+
+CODE_LIST_COLUMNS = ['list_name', 'code', 'description_nl', 'description_en']
+
+
+def file_sha256(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows of a frame as dicts, with None (not NaN) for missing values."""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def code_lists_to_frame(code_lists: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Flatten code lists to one row per code."""
+    rows = [(cl['name'], c['code'], c.get('description_nl'), c.get('description_en'))
+            for cl in code_lists for c in cl['codes']]
+    return pd.DataFrame(rows, columns=CODE_LIST_COLUMNS, dtype=object)
+
+
+def code_lists_from_frame(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Regroup a flattened code list frame, keeping list and code order."""
+    lists: Dict[str, List[Dict[str, Any]]] = {}
+    for row in _frame_records(frame):
+        lists.setdefault(row['list_name'], []).append({
+            'code': row['code'],
+            'description_nl': row['description_nl'],
+            'description_en': row['description_en'],
+        })
+    return [{'name': name, 'codes': codes} for name, codes in lists.items()]
+
+
+def _cache_paths(cache_dir: str, key: str) -> Tuple[str, str]:
+    ext = 'parquet' if pyarrow else 'pkl'
+    return (os.path.join(cache_dir, f'{key}.attributes.{ext}'),
+            os.path.join(cache_dir, f'{key}.code_lists.{ext}'))
+
+
+def _read_frame(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path) if pyarrow else pd.read_pickle(path)
+
+
+def _write_frame(frame: pd.DataFrame, path: str):
+    # Write then rename, so an interrupted run never leaves a truncated entry
+    tmp_path = f'{path}.tmp'
+    if pyarrow:
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def parse_workbook(filepath: str, profile: Optional[DatamodelProfile] = None,
+                   cache_dir: str = DATAMODEL_CACHE_DIR,
+                   use_cache: bool = DATAMODEL_CACHE_ENABLED) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Attributes and code lists of a datamodel workbook.
+
+    Parses are cached under cache_dir as Parquet (pickle without pyarrow),
+    keyed by the workbook's SHA-256, PARSER_VERSION and the profile, so an
+    unchanged workbook is only hashed, never decoded, on later runs.
+    """
+    key = f"{file_sha256(filepath)}.v{PARSER_VERSION}.{profile.name if profile else 'auto'}"
+    attributes_path, code_lists_path = _cache_paths(cache_dir, key)
+
+    if use_cache and os.path.exists(attributes_path) and os.path.exists(code_lists_path):
+        print(f"Using cached parse of {os.path.basename(filepath)} ({key[:12]})")
+        return _frame_records(_read_frame(attributes_path)), code_lists_from_frame(_read_frame(code_lists_path))
+
+    if profile is None:
+        wb = load_workbook(filepath, read_only=True)
+        profile = detect_profile(wb.sheetnames)
+        wb.close()
+
+    attributes = list(iter_datamodel_attributes(filepath, profile))
+    code_lists = parse_code_lists(filepath, profile.code_list_sheet) if profile.code_list_sheet else []
+
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        columns = list(attributes[0]) if attributes else []
+        _write_frame(pd.DataFrame(attributes, columns=columns, dtype=object), attributes_path)
+        _write_frame(code_lists_to_frame(code_lists), code_lists_path)
+
+    return attributes, code_lists
+
+
+DATAMODEL_URL = 'https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/welke-data/datamodel/'
+
+# Attribute fields shown in FMCG/DIY attribute documents, in unpacking order
+ATTRIBUTE_CONTENT_FIELDS = (
+    'attribute_name_nl', 'gdsn_name', 'bms_id', 'tc_field_id', 'definition_nl', 'instruction_nl',
+    'example', 'remarks', 'data_type', 'max_length', 'code_list', 'model_layer', 'gdsn_xpath',
+)
+HEALTHCARE_CONTENT_FIELDS = (
+    'attribute_name_en', 'business_name', 'bms_id', 'definition_en', 'business_definition',
+    'instruction_en', 'example', 'technical_notation',
+)
+
+# Limit codes shown in code list content
+MAX_CODES_SHOWN = 100
+
+_MISSING_VALUES = frozenset((None, 'nan', 'None', 'NaN'))
+
+
+def clean(val: Any) -> str:
+    """Display value of a parsed field, 'N/A' for missing values."""
+    if val in _MISSING_VALUES:
+        return 'N/A'
+    return str(val).strip()
+
+
+def clean_fields(record: Dict[str, Any], fields: Sequence[str]) -> List[str]:
+    """clean() applied to each of `fields`, inlined to save a call per field."""
+    return ['N/A' if val in _MISSING_VALUES else str(val).strip() for val in map(record.get, fields)]
+
+
+def render_attribute_content(attr: Dict[str, Any], sector: str, version: str) -> str:
+    """Attribute document text; every field is cleaned exactly once."""
+    (name, gdsn_name, bms_id, tc_field_id, definition, instruction, example, remarks,
+     data_type, max_length, code_list, model_layer, gdsn_xpath) = clean_fields(attr, ATTRIBUTE_CONTENT_FIELDS)
+
+    return f"""GS1 Benelux {sector} Datamodel - Attribuut: {name}
 
 **Identificatie**
-- Lokale attribuutnaam (NL): {clean(attr.get('attribute_name_nl'))}
-- GDSN naam: {clean(attr.get('gdsn_name'))}
-- BMS ID: {clean(attr.get('bms_id'))}
-- TC Field ID: {clean(attr.get('tc_field_id'))}
+- Lokale attribuutnaam (NL): {name}
+- GDSN naam: {gdsn_name}
+- BMS ID: {bms_id}
+- TC Field ID: {tc_field_id}
 
 **Definitie**
-{clean(attr.get('definition_nl'))}
+{definition}
 
 **Invulinstructie**
-{clean(attr.get('instruction_nl'))}
+{instruction}
 
-**Voorbeeld**: {clean(attr.get('example'))}
+**Voorbeeld**: {example}
 
-**Opmerkingen**: {clean(attr.get('remarks'))}
+**Opmerkingen**: {remarks}
 
 **Technische specificaties**
-- Data type: {clean(attr.get('data_type'))}
-- Maximale lengte: {clean(attr.get('max_length'))}
-- Codelijst: {clean(attr.get('code_list'))}
-- Model laag: {clean(attr.get('model_layer'))}
+- Data type: {data_type}
+- Maximale lengte: {max_length}
+- Codelijst: {code_list}
+- Model laag: {model_layer}
 
-**GDSN XPath**: {clean(attr.get('gdsn_xpath'))}
+**GDSN XPath**: {gdsn_xpath}
 
 Bron: GS1 Benelux {sector} Datamodel versie {version}
-URL: https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/welke-data/datamodel/
+URL: {DATAMODEL_URL}
 """
-        
-        content_items.append({
+
+
+def render_code_list_content(name: str, codes: List[Dict[str, Any]], sector: str, version: str) -> str:
+    """Code list document text, showing at most MAX_CODES_SHOWN codes."""
+    codes_text = '\n'.join([
+        f"  - {c.get('code', 'N/A')}: {c.get('description_nl', 'N/A')}"
+        for c in codes[:MAX_CODES_SHOWN]
+    ])
+    more_text = f"\n  ... en {len(codes) - MAX_CODES_SHOWN} meer" if len(codes) > MAX_CODES_SHOWN else ""
+
+    return f"""GS1 Benelux {sector} Codelijst: {name}
+
+Deze codelijst bevat {len(codes)} waarden die gebruikt kunnen worden in GS1 Data Source voor de {sector} sector.
+
+**Codes:**
+{codes_text}{more_text}
+
+Bron: GS1 Benelux {sector} Datamodel versie {version}
+URL: {DATAMODEL_URL}
+"""
+
+
+def iter_knowledge_content(attributes: Iterable[Dict], code_lists: Iterable[Dict], sector: str,
+                           version: str) -> Iterator[Dict[str, Any]]:
+    """Yield knowledge base content items from a parsed datamodel."""
+
+    # Generate content for each attribute
+    for attr in attributes:
+        if not attr.get('attribute_name_nl'):
+            continue
+
+        yield {
             'title': f"GS1 Benelux {sector} - {attr['attribute_name_nl']}",
-            'content': content,
+            'content': render_attribute_content(attr, sector, version),
             'source_type': 'gs1_nl_datamodel',
             'sector': sector,
             'attribute_name_nl': attr.get('attribute_name_nl'),
@@ -169,91 +512,299 @@ URL: https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/we
             'bms_id': attr.get('bms_id'),
             'model_layer': attr.get('model_layer'),
             'data_type': attr.get('data_type'),
-            'url': 'https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/welke-data/datamodel/',
+            'url': DATAMODEL_URL,
             'version': version
-        })
-    
+        }
+
     # Generate content for code lists
     for cl in code_lists:
-        if not cl.get('name') or not cl.get('codes'):
+        codes = cl.get('codes')
+        if not cl.get('name') or not codes:
             continue
-        
-        # Limit codes shown in content
-        max_codes = 100
-        codes_text = "\n".join([
-            f"  - {c.get('code', 'N/A')}: {c.get('description_nl', 'N/A')}"
-            for c in cl['codes'][:max_codes]
-        ])
-        
-        more_text = f"\n  ... en {len(cl['codes']) - max_codes} meer" if len(cl['codes']) > max_codes else ""
-        
-        content = f"""GS1 Benelux {sector} Codelijst: {cl['name']}
-
-Deze codelijst bevat {len(cl['codes'])} waarden die gebruikt kunnen worden in GS1 Data Source voor de {sector} sector.
-
-**Codes:**
-{codes_text}{more_text}
 
-Bron: GS1 Benelux {sector} Datamodel versie {version}
-URL: https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/welke-data/datamodel/
-"""
-        
-        content_items.append({
+        yield {
             'title': f"GS1 Benelux {sector} Codelijst - {cl['name']}",
-            'content': content,
+            'content': render_code_list_content(cl['name'], codes, sector, version),
             'source_type': 'gs1_nl_codelist',
             'sector': sector,
             'code_list_name': cl['name'],
-            'code_count': len(cl['codes']),
-            'url': 'https://www.gs1.nl/kennisbank/gs1-data-source/levensmiddelen-drogisterij/welke-data/datamodel/',
+            'code_count': len(codes),
+            'url': DATAMODEL_URL,
             'version': version
-        })
-    
-    return content_items
+        }
+
+
+def generate_knowledge_content(attributes: List[Dict], code_lists: List[Dict], sector: str, version: str) -> List[Dict[str, Any]]:
+    """Generate knowledge base content from parsed datamodel."""
+    return list(iter_knowledge_content(attributes, code_lists, sector, version))
+
+
+def render_healthcare_content(attr: Dict[str, Any], url: str) -> str:
+    """ECHO attribute document text; every field is cleaned exactly once."""
+    (name, business_name, bms_id, definition, business_definition, instruction, example,
+     echo_notation) = clean_fields(attr, HEALTHCARE_CONTENT_FIELDS)
+
+    content = f"""GS1 Benelux Healthcare Datamodel - Attribuut: {name}
+
+**Identificatie**
+- Attribuutnaam (EN): {name}
+- Business naam: {business_name}
+- BMS ID: {bms_id}
+
+**Definitie**
+{definition}"""
+    if attr.get('business_definition'):
+        content += f"\n\n**Business Definitie**\n{business_definition}"
+    content += f"\n\n**Invulinstructie**\n{instruction}\n\n**Voorbeeld**\n{example}"
+    if attr.get('technical_notation'):
+        content += f"\n\n**ECHO Common Data Set**\n{echo_notation}"
+    return content + f"\n\nBron: GS1 Benelux Healthcare Datamodel (ECHO)\nURL: {url}"
+
+
+def iter_healthcare_content(attributes: Iterable[Dict], version: str) -> Iterator[Dict[str, Any]]:
+    """Yield knowledge base content items from a parsed ECHO healthcare datamodel."""
+
+    url = f"https://www.gs1belu.org/en/documentation/healthcare-datamodel-{version.replace('.', '')}"
+
+    for attr in attributes:
+        name = attr.get('attribute_name_en')
+        if not name:
+            continue
+
+        yield {
+            'title': f"GS1 Healthcare - {name}",
+            'content': render_healthcare_content(attr, url),
+            'source_type': 'gs1_nl_datamodel',
+            'sector': 'Healthcare',
+            'attribute_name_en': name,
+            'business_name': attr.get('business_name'),
+            'bms_id': attr.get('bms_id'),
+            'url': url,
+            'version': version
+        }
+
+
+def generate_healthcare_content(attributes: List[Dict], version: str) -> List[Dict[str, Any]]:
+    """Generate knowledge base content from a parsed ECHO healthcare datamodel."""
+    return list(iter_healthcare_content(attributes, version))
+
+
+def write_jsonl(items: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """Stream content items to a JSON Lines file, one item per line.
+
+    Items are written as they are produced, so generators are never
+    materialised; the file is replaced atomically when complete.
+    """
+    count = 0
+    tmp_path = f'{output_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    os.replace(tmp_path, output_path)
+    return count
+
+
+DATASOURCE_DIR = 'data/standards/gs1-nl/benelux-datasource'
+REGISTRY_PATH = 'data/metadata/dataset_registry.json'
+OUTPUT_DIR = 'data/gs1nl'
+
+# Workbooks outside DATASOURCE_DIR that are parsed when present
+EXTRA_WORKBOOKS = ['data/gs1nl/benelux-fmcg-datamodel-3.1.34.2.xlsx']
+
+# Registry sector ids / filename hints -> (profile name, sector label)
+SECTORS = {
+    'fmcg': ('fmcg', 'FMCG'),
+    'diy': ('diy', 'DIY'),
+    'diy_garden_pet': ('diy', 'DIY'),
+    'healthcare': ('healthcare', 'Healthcare'),
+    'echo': ('healthcare', 'Healthcare'),
+}
+
+
+@dataclass
+class WorkbookJob:
+    path: str
+    version: str
+    profile: Optional[str] = None
+    sector: Optional[str] = None
+    status: str = 'current'
+
+
+def load_registry_workbooks(registry_path: str = REGISTRY_PATH) -> Dict[str, Dict[str, str]]:
+    """Registry metadata of the Benelux datamodel workbooks, keyed by download file name."""
+    if not os.path.exists(registry_path):
+        return {}
+    with open(registry_path, 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+
+    workbooks = {}
+    for entry in registry.get('registeredStandards', []):
+        parts = entry.get('id', '').split('.')
+        link = entry.get('directDownloadLink', '')
+        if parts[:2] != ['gs1nl', 'benelux'] or len(parts) < 3 or parts[2] not in SECTORS:
+            continue
+        workbooks[os.path.basename(link)] = {
+            'sector': parts[2],
+            'version': entry.get('version', 'unknown'),
+            'status': entry.get('status', 'current'),
+        }
+    return workbooks
+
+
+def discover_workbooks(paths: List[str], registry_only: bool = False) -> List[WorkbookJob]:
+    """Build parse jobs, taking sector and version from the registry where listed."""
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(DATASOURCE_DIR, '**', '*.xlsx'), recursive=True))
+        # Skip the ~$ lock files Excel leaves next to open workbooks
+        paths = [p for p in paths if not os.path.basename(p).startswith('~$')]
+        paths += [p for p in EXTRA_WORKBOOKS if os.path.exists(p)]
+
+    registry = load_registry_workbooks()
+    jobs = []
+    for path in paths:
+        filename = os.path.basename(path)
+        meta = registry.get(filename)
+        if meta:
+            profile, sector = SECTORS[meta['sector']]
+            jobs.append(WorkbookJob(path, meta['version'], profile, sector, meta['status']))
+        elif not registry_only:
+            version = re.search(r'\d+(?:\.\d+)+', filename)
+            hint = next((key for key in SECTORS if key in filename.lower()), None)
+            profile, sector = SECTORS[hint] if hint else (None, None)
+            jobs.append(WorkbookJob(path, version.group(0) if version else 'unknown', profile, sector))
+    return jobs
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r'\d+', version))
+
+
+# Raised by openpyxl for corrupt, truncated or non-workbook files (e.g. Excel ~$ lock files)
+UNREADABLE_WORKBOOK_ERRORS = (zipfile.BadZipFile, InvalidFileException, OSError)
+
+
+def resolve_profile(job: WorkbookJob) -> DatamodelProfile:
+    """The job's layout profile, detected from the sheet names when not known up front."""
+    if job.profile:
+        return DATAMODEL_PROFILES[job.profile]
+    wb = load_workbook(job.path, read_only=True)
+    try:
+        return detect_profile(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def parse_workbook_job(job: WorkbookJob, staging_dir: str) -> Dict[str, Any]:
+    """Parse one workbook and stream its content to a JSONL file in staging_dir.
+
+    Runs in a worker process; only counts and the file path travel back.
+    """
+    try:
+        profile = resolve_profile(job)
+        sector = job.sector or SECTORS[profile.name][1]
+
+        attributes, code_lists = parse_workbook(job.path, profile)
+        if profile.name == HEALTHCARE_PROFILE.name:
+            content_items = iter_healthcare_content(attributes, job.version)
+        else:
+            content_items = iter_knowledge_content(attributes, code_lists, sector, job.version)
+
+        content_path = os.path.join(staging_dir, f'{os.path.basename(job.path)}.{os.getpid()}.jsonl')
+        count = write_jsonl(content_items, content_path)
+    except (ValueError, KeyError) as e:
+        return {'job': job, 'error': str(e)}
+    except UNREADABLE_WORKBOOK_ERRORS as e:
+        # Corrupt or unreadable workbook: skip it rather than abort the whole pool
+        return {'job': job, 'error': f'unreadable workbook ({e})'}
+
+    return {
+        'job': job,
+        'sector': sector,
+        'attributes': len(attributes),
+        'code_lists': len(code_lists),
+        'content_items': count,
+        'content_path': content_path,
+    }
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the items of a JSON Lines file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_content(content_items: Iterable[Dict[str, Any]], output_path: str):
+    """Write content as JSON Lines when the path ends in .jsonl, else as a JSON array."""
+    if output_path.endswith('.jsonl'):
+        count = write_jsonl(content_items, output_path)
+    else:
+        content_items = list(content_items)
+        count = len(content_items)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(content_items, f, ensure_ascii=False, indent=2)
+    print(f"Saved {count} content items to {output_path}")
 
 
 def main():
-    """Main function to parse datamodel and generate content."""
-    
-    filepath = 'data/gs1nl/benelux-fmcg-datamodel-3.1.34.2.xlsx'
-    version = '3.1.34.2'
-    
-    print("Parsing FMCG datamodel attributes...")
-    attributes = parse_fmcg_datamodel(filepath)
-    print(f"Found {len(attributes)} attributes")
-    
-    # Print sample attribute to verify parsing
-    if attributes:
-        print("\nSample attribute:")
-        sample = attributes[0]
-        for k, v in sample.items():
-            val_str = str(v)[:80] if v else 'None'
-            print(f"  {k}: {val_str}")
-    
-    print("\nParsing code lists...")
-    code_lists = parse_code_lists(filepath)
-    print(f"Found {len(code_lists)} code lists")
-    
-    # Print code list names
-    if code_lists:
-        print("Code lists found:")
-        for cl in code_lists[:5]:
-            print(f"  - {cl['name']}: {len(cl['codes'])} codes")
-    
-    print("\nGenerating knowledge content...")
-    content_items = generate_knowledge_content(attributes, code_lists, 'FMCG', version)
-    print(f"Generated {len(content_items)} content items")
-    
-    # Save to JSON for further processing
-    output_path = 'data/gs1nl/fmcg_datamodel_content.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(content_items, f, ensure_ascii=False, indent=2)
-    print(f"\nSaved content to {output_path}")
-    
-    # Print sample content
-    if content_items:
-        print("\n--- Sample content item ---")
-        print(content_items[0]['content'][:1000])
+    """Parse the Benelux datamodel workbooks in parallel and generate content."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('workbooks', nargs='*',
+                        help=f'Workbooks to parse (default: every .xlsx under {DATASOURCE_DIR})')
+    parser.add_argument('--registry', action='store_true',
+                        help='Only parse workbooks listed in the dataset registry')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: %(default)s)')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help='Directory for <sector>_datamodel_content.jsonl (default: %(default)s)')
+    parser.add_argument('--merge', metavar='PATH',
+                        help='Write all content to one file instead (.jsonl, or .json for a JSON array)')
+    args = parser.parse_args()
+
+    jobs = discover_workbooks(args.workbooks, registry_only=args.registry)
+    if not jobs:
+        print("No workbooks to parse")
+        return
+    print(f"Parsing {len(jobs)} workbooks with {min(args.workers, len(jobs))} workers...")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Staged next to the outputs so finished files can be renamed into place
+    staging_dir = tempfile.mkdtemp(prefix='.datamodel-', dir=args.output_dir)
+    try:
+        results = []
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+            for result in pool.map(partial(parse_workbook_job, staging_dir=staging_dir), jobs):
+                job = result['job']
+                if 'error' in result:
+                    print(f"  Skipping {job.path}: {result['error']}")
+                    continue
+                print(f"  {job.path}: {result['sector']} {job.version}, {result['attributes']} attributes, "
+                      f"{result['code_lists']} code lists, {result['content_items']} content items")
+                results.append(result)
+
+        if args.merge:
+            write_content((item for r in results for item in read_jsonl(r['content_path'])), args.merge)
+            return
+
+        # Per-sector output comes from the newest current workbook of each sector
+        newest: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            job = result['job']
+            best = newest.get(result['sector'])
+            rank = (job.status != 'deprecated', version_key(job.version))
+            if best is None or rank > (best['job'].status != 'deprecated', version_key(best['job'].version)):
+                newest[result['sector']] = result
+
+        for sector, result in newest.items():
+            output_path = os.path.join(args.output_dir, f'{sector.lower()}_datamodel_content.jsonl')
+            os.replace(result['content_path'], output_path)
+            print(f"Saved {result['content_items']} content items to {output_path}")
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
 
 
 if __name__ == '__main__':
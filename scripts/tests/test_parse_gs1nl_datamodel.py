@@ -0,0 +1,62 @@
+"""
+Tests for scripts/parse_gs1nl_datamodel.py: unreadable workbooks are skipped, not fatal.
+
+  python -m pytest scripts/tests
+"""
+
+import json
+import os
+import sys
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_gs1nl_datamodel as datamodel  # noqa: E402
+
+
+def make_fmcg_workbook(path: str, rows: int = 5) -> None:
+    """A minimal FMCG datamodel: an Attributen sheet and one code list."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Attributen'
+    ws.append(['Benelux datamodel'])
+    ws.append(['Lokale attribuutnaam', 'GDSN naam', 'BMS ID', 'TC Field ID', 'Kolom 4', 'Definitie',
+               'Voorbeeld', 'Instructies', 'Opmerkingen'])
+    for i in range(rows):
+        ws.append([f'Attribuut {i}', f'gdsnName{i}', 1000 + i, f'T{i}', None, f'Definitie van attribuut {i}',
+                   f'Voorbeeld {i}', f'Instructie {i}', None])
+    code_lists = wb.create_sheet('Codelijsten')
+    code_lists.append(['Codelijst Test', None])
+    code_lists.append(['Code', 'Omschrijving'])
+    code_lists.append(['A', 'Eerste code'])
+    wb.save(path)
+
+
+def test_discover_skips_excel_lock_files(tmp_path, monkeypatch):
+    make_fmcg_workbook(str(tmp_path / 'benelux-fmcg-datamodel-3.1.33.xlsx'))
+    (tmp_path / '~$benelux-fmcg-datamodel-3.1.33.xlsx').write_bytes(b'\x00lock')
+    monkeypatch.setattr(datamodel, 'DATASOURCE_DIR', str(tmp_path))
+    monkeypatch.setattr(datamodel, 'EXTRA_WORKBOOKS', [])
+
+    jobs = datamodel.discover_workbooks([])
+
+    assert [os.path.basename(job.path) for job in jobs] == ['benelux-fmcg-datamodel-3.1.33.xlsx']
+
+
+def test_unreadable_workbook_is_skipped(tmp_path, monkeypatch, capsys):
+    good = tmp_path / 'benelux-fmcg-datamodel-3.1.33.xlsx'
+    bad = tmp_path / 'benelux-fmcg-datamodel-3.1.34.xlsx'
+    make_fmcg_workbook(str(good))
+    bad.write_bytes(b'not a zip archive')
+    merged = tmp_path / 'merged.jsonl'
+    monkeypatch.setattr(sys, 'argv', ['parse_gs1nl_datamodel.py', str(good), str(bad), '--workers', '2',
+                                      '--output-dir', str(tmp_path), '--merge', str(merged)])
+
+    datamodel.main()
+
+    out = capsys.readouterr().out
+    assert f'Skipping {bad}: unreadable workbook' in out
+    items = [json.loads(line) for line in merged.read_text(encoding='utf-8').splitlines()]
+    assert items
+    assert {item['version'] for item in items} == {'3.1.33'}
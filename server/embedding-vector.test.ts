@@ -0,0 +1,38 @@
+import { describe, it, expect } from "vitest";
+
+import { decodeEmbeddingVector } from "./embedding-vector";
+
+// Blobs for [0.5, -0.25, 1.0] from scripts/knowledge_ingest/vectors.py encode_vector()
+function fromHex(hex: string): Uint8Array {
+  return Uint8Array.from(hex.match(/../g)!.map(byte => parseInt(byte, 16)));
+}
+
+describe("decodeEmbeddingVector", () => {
+  it("decodes float32 vectors", () => {
+    expect(decodeEmbeddingVector(fromHex("0103000000003f000080be0000803f"))).toEqual([0.5, -0.25, 1.0]);
+  });
+
+  it("decodes float16 vectors", () => {
+    expect(decodeEmbeddingVector(fromHex("020300003800b4003c"))).toEqual([0.5, -0.25, 1.0]);
+  });
+
+  it("decodes int8 vectors with their scale", () => {
+    const vector = decodeEmbeddingVector(fromHex("0303000402013c40e07f"))!;
+    expect(vector).toHaveLength(3);
+    expect(vector[0]).toBeCloseTo(0.5039, 3);
+    expect(vector[1]).toBeCloseTo(-0.252, 3);
+    expect(vector[2]).toBeCloseTo(1.0, 5);
+  });
+
+  it("decodes blobs that are views into a larger buffer", () => {
+    const padded = fromHex("ff0103000000003f000080be0000803f");
+    expect(decodeEmbeddingVector(padded.subarray(1))).toEqual([0.5, -0.25, 1.0]);
+  });
+
+  it("returns null for missing, truncated or unknown blobs", () => {
+    expect(decodeEmbeddingVector(null)).toBeNull();
+    expect(decodeEmbeddingVector(fromHex("0103"))).toBeNull();
+    expect(decodeEmbeddingVector(fromHex("0103000000003f"))).toBeNull();
+    expect(decodeEmbeddingVector(fromHex("0903000000"))).toBeNull();
+  });
+});
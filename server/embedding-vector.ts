@@ -0,0 +1,72 @@
+/**
+ * Packed Embedding Vector Decoder
+ *
+ * Reads the binary knowledge_embeddings.embedding_vector column written by the
+ * Python ingestion scripts (scripts/knowledge_ingest/vectors.py). The layout is
+ * little-endian:
+ *
+ *   uint8 format (1 = float32, 2 = float16, 3 = int8) | uint16 dimensions |
+ *   [float32 scale, int8 only] | packed components
+ *
+ * Decoding a blob is a straight typed read, much cheaper than JSON.parse on
+ * the ~19 KB JSON text of a 1536-dimension vector.
+ */
+
+const FORMAT_F32 = 1;
+const FORMAT_F16 = 2;
+const FORMAT_INT8 = 3;
+
+const HEADER_BYTES = 3;
+const SCALE_BYTES = 4;
+
+function float16ToNumber(bits: number): number {
+  const sign = bits & 0x8000 ? -1 : 1;
+  const exponent = (bits >> 10) & 0x1f;
+  const fraction = bits & 0x3ff;
+  if (exponent === 0) return sign * 2 ** -14 * (fraction / 1024);
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+  return sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+}
+
+/**
+ * Decode a packed embedding vector.
+ * Returns null for a missing, truncated or unknown-format blob, so callers can
+ * fall back to the JSON embedding column.
+ */
+export function decodeEmbeddingVector(
+  blob: Uint8Array | null | undefined
+): number[] | null {
+  if (!blob || blob.byteLength < HEADER_BYTES) return null;
+  const view = new DataView(blob.buffer, blob.byteOffset, blob.byteLength);
+  const format = view.getUint8(0);
+  const dimensions = view.getUint16(1, true);
+  const vector = new Array<number>(dimensions);
+
+  if (format === FORMAT_F32) {
+    if (blob.byteLength !== HEADER_BYTES + dimensions * 4) return null;
+    for (let i = 0; i < dimensions; i++) {
+      vector[i] = view.getFloat32(HEADER_BYTES + i * 4, true);
+    }
+    return vector;
+  }
+
+  if (format === FORMAT_F16) {
+    if (blob.byteLength !== HEADER_BYTES + dimensions * 2) return null;
+    for (let i = 0; i < dimensions; i++) {
+      vector[i] = float16ToNumber(view.getUint16(HEADER_BYTES + i * 2, true));
+    }
+    return vector;
+  }
+
+  if (format === FORMAT_INT8) {
+    const offset = HEADER_BYTES + SCALE_BYTES;
+    if (blob.byteLength !== offset + dimensions) return null;
+    const scale = view.getFloat32(HEADER_BYTES, true);
+    for (let i = 0; i < dimensions; i++) {
+      vector[i] = view.getInt8(offset + i) * scale;
+    }
+    return vector;
+  }
+
+  return null;
+}
@@ -16,6 +16,7 @@
 import { getDb } from "./db";
 import { sql } from "drizzle-orm";
 import { generateEmbedding, cosineSimilarity } from "./_core/embedding";
+import { decodeEmbeddingVector } from "./embedding-vector";
 import { serverLogger } from "./_core/logger-wiring";
 
 /**
@@ -117,6 +118,7 @@ export async function searchKnowledgeEmbeddings(
         content: knowledgeEmbeddings.content,
         url: knowledgeEmbeddings.url,
         embedding: knowledgeEmbeddings.embedding,
+        embeddingVector: knowledgeEmbeddings.embeddingVector,
         authorityLevel: knowledgeEmbeddings.authority_level,
         semanticLayer: knowledgeEmbeddings.semantic_layer,
         sourceAuthority: knowledgeEmbeddings.source_authority,
@@ -132,19 +134,22 @@ export async function searchKnowledgeEmbeddings(
     const results: KnowledgeSearchResult[] = [];
 
     for (const item of allEmbeddings) {
-      // Skip if no valid embedding - pgvector returns string like '[0.1,0.2,...]'
-      if (!item.embedding) continue;
-      let embArr: number[];
-      if (typeof item.embedding === 'string') {
-        try {
-          embArr = JSON.parse(item.embedding);
-        } catch {
+      // Prefer the packed vector: a typed read instead of a JSON parse
+      let embArr = decodeEmbeddingVector(item.embeddingVector);
+      if (!embArr) {
+        // Skip if no valid embedding - pgvector returns string like '[0.1,0.2,...]'
+        if (!item.embedding) continue;
+        if (typeof item.embedding === 'string') {
+          try {
+            embArr = JSON.parse(item.embedding);
+          } catch {
+            continue;
+          }
+        } else if (Array.isArray(item.embedding)) {
+          embArr = item.embedding;
+        } else {
           continue;
         }
-      } else if (Array.isArray(item.embedding)) {
-        embArr = item.embedding;
-      } else {
-        continue;
       }
       if (!embArr || embArr.length === 0) continue;
 